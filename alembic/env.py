@@ -26,6 +26,22 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# Full-text search objects created with raw SQL in b3d07e5f6a21: the SQLite FTS5
+# table with its shadow tables (its triggers are not compared) and the
+# PostgreSQL trigram index. Autogenerate would otherwise emit drops for them.
+UNMANAGED_TABLE_PREFIX = "organizations_fts"
+UNMANAGED_INDEXES = {"ix_organizations_name_trgm"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if reflected and compare_to is None:
+        if type_ == "table" and name.startswith(UNMANAGED_TABLE_PREFIX):
+            return False
+        if type_ == "index" and name in UNMANAGED_INDEXES:
+            return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,6 +64,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -71,7 +88,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
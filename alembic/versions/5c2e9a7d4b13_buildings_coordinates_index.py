@@ -0,0 +1,26 @@
+"""buildings coordinates index
+
+Revision ID: 5c2e9a7d4b13
+Revises: 1018fc89e2d6
+Create Date: 2026-10-18 10:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e9a7d4b13'
+down_revision: Union[str, None] = '1018fc89e2d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_buildings_latitude_longitude', 'buildings', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_buildings_latitude_longitude', table_name='buildings')
@@ -0,0 +1,51 @@
+"""activity closure
+
+Revision ID: 8f41b7c2d9e0
+Revises: 5c2e9a7d4b13
+Create Date: 2026-10-18 11:03:27.904611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f41b7c2d9e0'
+down_revision: Union[str, None] = '5c2e9a7d4b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('activity_closure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['activities.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['activities.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index(op.f('ix_activity_closure_descendant_id'), 'activity_closure', ['descendant_id'], unique=False)
+    op.create_index(
+        op.f('ix_organization_activities_activity_id'), 'organization_activities', ['activity_id'], unique=False
+    )
+    op.execute(
+        """
+        WITH RECURSIVE closure(ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM activities
+            UNION ALL
+            SELECT closure.ancestor_id, activities.id, closure.depth + 1
+            FROM closure JOIN activities ON activities.parent_id = closure.descendant_id
+        )
+        INSERT INTO activity_closure (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, descendant_id, depth FROM closure
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_organization_activities_activity_id'), table_name='organization_activities')
+    op.drop_index(op.f('ix_activity_closure_descendant_id'), table_name='activity_closure')
+    op.drop_table('activity_closure')
@@ -0,0 +1,58 @@
+"""organization name search
+
+Revision ID: b3d07e5f6a21
+Revises: 8f41b7c2d9e0
+Create Date: 2026-10-18 11:47:09.266170
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d07e5f6a21'
+down_revision: Union[str, None] = '8f41b7c2d9e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "sqlite":
+        # External-content FTS5 table: only the trigram index is stored, names stay in organizations.
+        op.execute(
+            "CREATE VIRTUAL TABLE organizations_fts USING fts5("
+            "name, content='organizations', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER organizations_fts_ai AFTER INSERT ON organizations BEGIN "
+            "INSERT INTO organizations_fts(rowid, name) VALUES (new.id, new.name); END"
+        )
+        op.execute(
+            "CREATE TRIGGER organizations_fts_ad AFTER DELETE ON organizations BEGIN "
+            "INSERT INTO organizations_fts(organizations_fts, rowid, name) VALUES ('delete', old.id, old.name); END"
+        )
+        op.execute(
+            "CREATE TRIGGER organizations_fts_au AFTER UPDATE OF name ON organizations BEGIN "
+            "INSERT INTO organizations_fts(organizations_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+            "INSERT INTO organizations_fts(rowid, name) VALUES (new.id, new.name); END"
+        )
+        op.execute("INSERT INTO organizations_fts(organizations_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX ix_organizations_name_trgm ON organizations USING gin (lower(name) gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS organizations_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS organizations_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS organizations_fts_ai")
+        op.execute("DROP TABLE IF EXISTS organizations_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_organizations_name_trgm")
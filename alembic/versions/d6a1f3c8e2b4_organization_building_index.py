@@ -0,0 +1,26 @@
+"""organization building index
+
+Revision ID: d6a1f3c8e2b4
+Revises: b3d07e5f6a21
+Create Date: 2026-10-18 21:04:12.730918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6a1f3c8e2b4'
+down_revision: Union[str, None] = 'b3d07e5f6a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_organizations_building_id'), 'organizations', ['building_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_organizations_building_id'), table_name='organizations')
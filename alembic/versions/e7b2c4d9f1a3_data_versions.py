@@ -0,0 +1,35 @@
+"""data versions
+
+Revision ID: e7b2c4d9f1a3
+Revises: d6a1f3c8e2b4
+Create Date: 2026-10-18 23:12:40.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2c4d9f1a3'
+down_revision: Union[str, None] = 'd6a1f3c8e2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    data_versions = op.create_table(
+        'data_versions',
+        sa.Column('scope', sa.String(length=32), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('scope'),
+    )
+    op.bulk_insert(
+        data_versions,
+        [{'scope': scope, 'version': 0} for scope in ('activities', 'buildings', 'organizations')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('data_versions')
@@ -0,0 +1,217 @@
+"""API key authentication and per-key rate limiting in front of the router."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import secrets
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any, Protocol
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import Settings
+from app.core.resp import RespClient, RespError
+
+API_KEY_HEADER = "X-API-Key"
+API_KEY_SCHEME = "APIKeyHeader"
+# ``scope["state"]`` entry holding the name of the key a request authenticated with.
+API_KEY_STATE = "api_key_name"
+
+# Tokens per request below the API prefix; everything else costs one.
+REQUEST_COSTS = {
+    "/organizations/": 5,
+    "/organizations/nearby": 5,
+    "/organizations/search": 5,
+    "/activities/search/organizations": 5,
+    "/organizations/export": 20,
+}
+
+
+class ApiKey:
+    """A client key; ``rate`` tokens per second up to ``burst``, or unlimited when ``rate`` is ``None``."""
+
+    __slots__ = ("name", "secret", "rate", "burst")
+
+    def __init__(self, name: str, secret: str, rate: float | None = None, burst: int | None = None):
+        self.name = name
+        self.secret = secret.encode()
+        self.rate = rate
+        # Five seconds' worth of requests by default.
+        self.burst = burst if burst is not None else max(1, math.ceil(5 * rate)) if rate else None
+
+
+class RateLimiter(Protocol):
+    # Blocking limiters are called through a worker thread when running on the event loop.
+    blocking: bool
+
+    def take(self, bucket: str, rate: float, burst: int, cost: int) -> float:
+        """Spend ``cost`` tokens; returns 0 when allowed, otherwise seconds until they are available."""
+        ...
+
+
+class MemoryRateLimiter:
+    """Token buckets of this process; with several workers each one enforces the limit on its own."""
+
+    blocking = False
+
+    def __init__(self) -> None:
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, bucket: str, rate: float, burst: int, cost: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(bucket, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens < cost:
+                self._buckets[bucket] = (tokens, now)
+                return (cost - tokens) / rate
+            self._buckets[bucket] = (tokens - cost, now)
+            return 0.0
+
+
+# Refill and spend atomically with the server's clock, so every worker shares one bucket per key.
+_TOKEN_BUCKET_SCRIPT = """
+local rate, burst, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens < cost then
+    wait = (cost - tokens) / rate
+else
+    tokens = tokens - cost
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+_TOKEN_BUCKET_SHA = hashlib.sha1(_TOKEN_BUCKET_SCRIPT.encode()).hexdigest()
+
+
+class RedisRateLimiter:
+    """Token buckets shared over RESP; a Lua script keeps each update atomic."""
+
+    blocking = True
+
+    def __init__(self, client: RespClient, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    def take(self, bucket: str, rate: float, burst: int, cost: int) -> float:
+        args = (1, self.prefix + bucket, rate, burst, cost)
+        try:
+            wait = self.client.execute("EVALSHA", _TOKEN_BUCKET_SHA, *args)
+        except RespError as exc:
+            if not str(exc).startswith("NOSCRIPT"):
+                raise
+            wait = self.client.execute("EVAL", _TOKEN_BUCKET_SCRIPT, *args)
+        return float(wait)
+
+
+class ApiKeyMiddleware:
+    """Requires a known ``X-API-Key`` below ``prefix``: 401 without one, 429 with ``Retry-After`` over the limit."""
+
+    def __init__(self, app: ASGIApp, *, keys: Iterable[ApiKey], limiter: RateLimiter, prefix: str):
+        self.app = app
+        self.keys = list(keys)
+        self.limiter = limiter
+        self.prefix = prefix.rstrip("/")
+
+    def _match(self, presented: str | None) -> ApiKey | None:
+        if presented is None:
+            return None
+        presented_bytes = presented.encode()
+        match = None
+        # Compare against every key so the time taken does not depend on which one matched.
+        for key in self.keys:
+            if secrets.compare_digest(presented_bytes, key.secret):
+                match = key
+        return match
+
+    async def _wait_seconds(self, key: ApiKey, cost: int) -> float:
+        cost = min(cost, key.burst)
+        try:
+            if self.limiter.blocking:
+                return await asyncio.to_thread(self.limiter.take, key.name, key.rate, key.burst, cost)
+            return self.limiter.take(key.name, key.rate, key.burst, cost)
+        except (OSError, RespError):
+            # A failing shared limiter lets requests through rather than taking the API down.
+            return 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not (path == self.prefix or path.startswith(self.prefix + "/")):
+            await self.app(scope, receive, send)
+            return
+
+        key = self._match(Headers(scope=scope).get(API_KEY_HEADER))
+        if key is None:
+            response = JSONResponse({"detail": "Invalid or missing API key"}, status_code=401)
+            await response(scope, receive, send)
+            return
+
+        # Downstream middleware (profiling) reads which client this is.
+        scope.setdefault("state", {})[API_KEY_STATE] = key.name
+        if key.rate is not None:
+            wait = await self._wait_seconds(key, REQUEST_COSTS.get(path[len(self.prefix) :], 1))
+            if wait > 0:
+                response = JSONResponse(
+                    {"detail": "Rate limit exceeded"},
+                    status_code=429,
+                    headers={"Retry-After": str(math.ceil(wait))},
+                )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
+
+
+def add_api_key_security(schema: dict[str, Any], prefix: str) -> dict[str, Any]:
+    """Declare the ``X-API-Key`` scheme and the 401/429 answers on every operation below ``prefix``."""
+    schema.setdefault("components", {}).setdefault("securitySchemes", {})[API_KEY_SCHEME] = {
+        "type": "apiKey",
+        "in": "header",
+        "name": API_KEY_HEADER,
+    }
+    prefix = prefix.rstrip("/")
+    for path, operations in schema.get("paths", {}).items():
+        if path != prefix and not path.startswith(prefix + "/"):
+            continue
+        for operation in operations.values():
+            operation["security"] = [{API_KEY_SCHEME: []}]
+            responses = operation.setdefault("responses", {})
+            responses.setdefault("401", {"description": "Invalid or missing API key"})
+            responses.setdefault("429", {"description": "Rate limit exceeded; see Retry-After"})
+    return schema
+
+
+def configured_api_keys(settings: Settings) -> list[ApiKey]:
+    """API_KEYS entries plus the legacy API_KEY as ``default``; keys without own limits use the global ones."""
+    keys = [
+        ApiKey(
+            entry.name,
+            entry.key,
+            entry.rate_limit_per_second or settings.rate_limit_per_second,
+            entry.rate_limit_burst or settings.rate_limit_burst,
+        )
+        for entry in settings.api_keys
+    ]
+    if all(entry.key != settings.api_key for entry in settings.api_keys):
+        keys.append(ApiKey("default", settings.api_key, settings.rate_limit_per_second, settings.rate_limit_burst))
+    return keys
+
+
+def build_rate_limiter(settings: Settings) -> RateLimiter:
+    if settings.rate_limit_backend == "redis":
+        return RedisRateLimiter(RespClient(settings.rate_limit_redis_url))
+    return MemoryRateLimiter()
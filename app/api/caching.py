@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from fastapi import Request, Response, status
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix still matches.
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def cached_json_response(request: Request, payload: bytes, digest: str, max_age: int) -> Response:
+    """Serve pre-serialized JSON with a strong ETag derived from ``digest``, or 304 if the client has it."""
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}, must-revalidate"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
@@ -1,47 +1,108 @@
-from collections.abc import Generator
+from collections.abc import AsyncIterator, Callable
+from typing import Any, Generic, TypeVar
 
-from fastapi import Depends, HTTPException, Security, status
-from fastapi.security import APIKeyHeader
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.api.responses import FastJSONResponse, json_dumps
 from app.dao import ActivityDAO, BuildingDAO, OrganizationDAO
 from app.core.config import Settings, get_settings
-from app.db.session import SessionLocal
-from app.services.activity_service import ActivityService
+from app.core.metrics import phase
+from app.db import session as db_session
+from app.schemas.serializers import OrganizationSerializer
+from app.services.activity_service import ActivityService, load_activity_tree
 from app.services.building_service import BuildingService
+from app.services.entity_cache import get_organization_cache
 from app.services.organization_service import OrganizationService
+from app.services.snapshot import current_snapshot
 
-api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
-
-
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+S = TypeVar("S")
+T = TypeVar("T")
 
 
 def get_settings_dependency() -> Settings:
     return get_settings()
 
 
-def require_api_key(
-    api_key: str | None = Security(api_key_header), settings: Settings = Depends(get_settings_dependency)
-) -> str:
-    if api_key != settings.api_key:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or missing API key")
-    return api_key
+# Routes only read: untracked records, or the in-memory snapshot with READ_SNAPSHOT_ENABLED.
+def build_activity_service(db: Session) -> ActivityService:
+    snapshot = current_snapshot(db)
+    if snapshot is not None:
+        return ActivityService(snapshot.activity_dao, snapshot.organization_dao)
+    return ActivityService(ActivityDAO(db), OrganizationDAO(db, readonly=True))
 
 
-def get_activity_service(db: Session = Depends(get_db)) -> ActivityService:
-    return ActivityService(ActivityDAO(db), OrganizationDAO(db))
+def build_building_service(db: Session) -> BuildingService:
+    snapshot = current_snapshot(db)
+    if snapshot is not None:
+        return BuildingService(snapshot.building_dao, snapshot.organization_dao)
+    organization_dao = OrganizationDAO(db, readonly=True)
+    return BuildingService(BuildingDAO(db), organization_dao)
 
 
-def get_building_service(db: Session = Depends(get_db)) -> BuildingService:
-    organization_dao = OrganizationDAO(db)
-    return BuildingService(BuildingDAO(db), organization_dao)
+def build_organization_service(db: Session) -> OrganizationService:
+    snapshot = current_snapshot(db)
+    if snapshot is not None:
+        # Cards are already in memory; the entity cache would only add a lookup.
+        return OrganizationService(snapshot.organization_dao, snapshot.building_dao)
+    return OrganizationService(OrganizationDAO(db, readonly=True), BuildingDAO(db), get_organization_cache())
+
+
+def build_organization_serializer(db: Session) -> OrganizationSerializer:
+    snapshot = current_snapshot(db)
+    activity_dao = snapshot.activity_dao if snapshot is not None else ActivityDAO(db)
+    return OrganizationSerializer(load_activity_tree(activity_dao).payloads)
+
+
+class ServiceRunner(Generic[S]):
+    """Runs service calls off the event loop: in the threadpool, or through ``AsyncSession.run_sync``."""
+
+    def __init__(self, factory: Callable[[Session], S], db: Session | AsyncSession):
+        self.factory = factory
+        self.db = db
+
+    async def _run(self, call: Callable[[Session], T]) -> T:
+        if isinstance(self.db, AsyncSession):
+            return await self.db.run_sync(call)
+        return await run_in_threadpool(call, self.db)
+
+    async def __call__(self, call: Callable[[S], T]) -> T:
+        def run(sync_db: Session) -> T:
+            with phase("app"):
+                return call(self.factory(sync_db))
+
+        return await self._run(run)
+
+    async def render(self, call: Callable[[S, OrganizationSerializer], Any]) -> FastJSONResponse:
+        """Run ``call`` and encode its plain-dict result, skipping ``response_model`` validation."""
+
+        def render(sync_db: Session) -> bytes:
+            with phase("app"):
+                content = call(self.factory(sync_db), build_organization_serializer(sync_db))
+            with phase("serialize"):
+                return json_dumps(content)
+
+        return FastJSONResponse(await self._run(render))
+
+
+def service_runner(factory: Callable[[Session], S]) -> Callable[..., AsyncIterator[ServiceRunner[S]]]:
+    async def dependency() -> AsyncIterator[ServiceRunner[S]]:
+        async_sessions = db_session.get_async_sessionmaker()
+        if async_sessions is not None:
+            async with async_sessions() as db:
+                yield ServiceRunner(factory, db)
+            return
+
+        db = db_session.get_sessionmaker()()
+        try:
+            yield ServiceRunner(factory, db)
+        finally:
+            await run_in_threadpool(db.close)
+
+    return dependency
 
 
-def get_organization_service(db: Session = Depends(get_db)) -> OrganizationService:
-    return OrganizationService(OrganizationDAO(db))
+get_activity_runner = service_runner(build_activity_service)
+get_building_runner = service_runner(build_building_service)
+get_organization_runner = service_runner(build_organization_service)
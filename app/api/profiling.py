@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.auth import API_KEY_STATE
+from app.core.metrics import RequestMetrics, current_metrics
+
+PROFILE_HEADER = "x-profile"
+PROFILE_SORT_KEYS = {"cumulative", "tottime", "calls"}
+
+
+class ProfilingMiddleware:
+    """Adds ``Server-Timing``; authenticated requests with ``X-Profile`` get a cProfile report instead."""
+
+    def __init__(self, app: ASGIApp, *, report_lines: int = 40):
+        self.app = app
+        self.report_lines = report_lines
+
+    def _profile_sort(self, scope: Scope) -> str | None:
+        requested = Headers(scope=scope).get(PROFILE_HEADER)
+        if requested is None or API_KEY_STATE not in scope.get("state", {}):
+            return None
+        return requested if requested in PROFILE_SORT_KEYS else "cumulative"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sort = self._profile_sort(scope)
+        metrics = RequestMetrics(cProfile.Profile() if sort is not None else None)
+        token = current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            if sort is None:
+
+                async def send_with_timing(message: Message) -> None:
+                    if message["type"] == "http.response.start":
+                        MutableHeaders(scope=message).append(
+                            "Server-Timing", metrics.server_timing(time.perf_counter() - started)
+                        )
+                    await send(message)
+
+                await self.app(scope, receive, send_with_timing)
+                return
+
+            status = 500
+
+            async def discard_body(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+
+            await self.app(scope, receive, discard_body)
+            report = self._report(metrics, sort, time.perf_counter() - started)
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (b"content-type", b"text/plain; charset=utf-8"),
+                        (b"content-length", str(len(report)).encode()),
+                        (b"server-timing", metrics.server_timing(time.perf_counter() - started).encode()),
+                        (b"x-profile-status", str(status).encode()),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": report})
+        finally:
+            current_metrics.reset(token)
+
+    def _report(self, metrics: RequestMetrics, sort: str, total_seconds: float) -> bytes:
+        output = io.StringIO()
+        output.write(f"Server-Timing: {metrics.server_timing(total_seconds)}\n\n")
+        metrics.profile.create_stats()
+        if not metrics.profile.stats:
+            output.write("No service or serialization work ran for this request.\n")
+        else:
+            stats = pstats.Stats(metrics.profile, stream=output)
+            stats.strip_dirs().sort_stats(sort).print_stats(self.report_lines)
+        return output.getvalue().encode()
@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 
-from app.api.routes import activities, buildings, organizations
+from app.api.routes import activities, buildings, organizations, system
 
 api_router = APIRouter()
 api_router.include_router(buildings.router)
 api_router.include_router(activities.router)
 api_router.include_router(organizations.router)
+api_router.include_router(system.router)
@@ -1,3 +1,3 @@
-from app.api.routes import activities, buildings, organizations
+from app.api.routes import activities, buildings, organizations, system
 
-__all__ = ["activities", "buildings", "organizations"]
+__all__ = ["activities", "buildings", "organizations", "system"]
@@ -1,36 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
-from app.api.deps import get_activity_service, require_api_key
+from app.api.caching import cached_json_response
+from app.api.deps import ServiceRunner, get_activity_runner, get_settings_dependency
+from app.core.config import Settings
 from app.schemas.activity import ActivityRead
-from app.schemas.organization import OrganizationRead
-from app.services.activity_service import ActivityService
-from app.services.exceptions import NotFoundError
+from app.schemas.organization import OrganizationCountRead, OrganizationPage
+from app.services.activity_service import ActivityService, cached_activity_counts, cached_activity_tree
+from app.services.exceptions import NotFoundError, ValidationError
 
-router = APIRouter(prefix="/activities", tags=["activities"], dependencies=[Depends(require_api_key)])
+router = APIRouter(prefix="/activities", tags=["activities"])
 
 
 @router.get("/", response_model=list[ActivityRead])
-def list_activities(service: ActivityService = Depends(get_activity_service)) -> list[ActivityRead]:
-    return service.get_activity_tree()
+async def list_activities(
+    request: Request,
+    run: ServiceRunner[ActivityService] = Depends(get_activity_runner),
+    settings: Settings = Depends(get_settings_dependency),
+) -> Response:
+    # A cached tree answers a matching ETag without a database round trip.
+    tree = cached_activity_tree() or await run(lambda service: service.activity_tree())
+    return cached_json_response(request, tree.json, tree.digest, settings.activities_cache_max_age)
 
 
-@router.get("/search/organizations", response_model=list[OrganizationRead])
-def organizations_for_activity_name(
+@router.get("/counts", response_model=list[OrganizationCountRead])
+async def activity_organization_counts(
+    request: Request,
+    run: ServiceRunner[ActivityService] = Depends(get_activity_runner),
+    settings: Settings = Depends(get_settings_dependency),
+) -> Response:
+    """Organizations per activity, including those of its descendants; each organization counts once."""
+    counts = cached_activity_counts() or await run(lambda service: service.organization_counts())
+    return cached_json_response(request, counts.json, counts.digest, settings.counts_cache_max_age)
+
+
+@router.get("/search/organizations", response_model=OrganizationPage)
+async def organizations_for_activity_name(
     name: str = Query(..., min_length=2),
-    service: ActivityService = Depends(get_activity_service),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    run: ServiceRunner[ActivityService] = Depends(get_activity_runner),
 ):
     try:
-        return service.organizations_for_activity_name(name)
+        return await run.render(
+            lambda service, serializer: serializer.page(
+                service.organizations_for_activity_name(name, limit, cursor)
+            )
+        )
     except NotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
-@router.get("/{activity_id}/organizations", response_model=list[OrganizationRead])
-def organizations_for_activity(
+@router.get("/{activity_id}/organizations", response_model=OrganizationPage)
+async def organizations_for_activity(
     activity_id: int,
-    service: ActivityService = Depends(get_activity_service),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    run: ServiceRunner[ActivityService] = Depends(get_activity_runner),
 ):
     try:
-        return service.organizations_for_activity(activity_id)
+        return await run.render(
+            lambda service, serializer: serializer.page(
+                service.organizations_for_activity(activity_id, limit, cursor)
+            )
+        )
     except NotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
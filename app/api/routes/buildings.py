@@ -1,24 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
 
-from app.api.deps import get_building_service, require_api_key
-from app.schemas.building import BuildingRead
-from app.schemas.organization import OrganizationRead
-from app.services.building_service import BuildingService
-from app.services.exceptions import NotFoundError
+from app.api.caching import cached_json_response
+from app.api.deps import ServiceRunner, get_building_runner, get_settings_dependency
+from app.core.config import Settings
+from app.schemas.building import BuildingRead, BuildingTileRead
+from app.schemas.organization import OrganizationCountRead, OrganizationPage
+from app.services.building_service import BuildingService, cached_building_counts
+from app.services.exceptions import NotFoundError, ValidationError
+from app.services.tiles import cached_building_tile
 
-router = APIRouter(prefix="/buildings", tags=["buildings"], dependencies=[Depends(require_api_key)])
+router = APIRouter(prefix="/buildings", tags=["buildings"])
 
 
 @router.get("/", response_model=list[BuildingRead])
-def list_buildings(service: BuildingService = Depends(get_building_service)):
-    return service.list_buildings()
+async def list_buildings(run: ServiceRunner[BuildingService] = Depends(get_building_runner)):
+    return await run(
+        lambda service: [BuildingRead.model_validate(building) for building in service.list_buildings()]
+    )
 
 
-@router.get("/{building_id}/organizations", response_model=list[OrganizationRead])
-def organizations_in_building(
-    building_id: int, service: BuildingService = Depends(get_building_service)
+@router.get("/counts", response_model=list[OrganizationCountRead])
+async def building_organization_counts(
+    request: Request,
+    run: ServiceRunner[BuildingService] = Depends(get_building_runner),
+    settings: Settings = Depends(get_settings_dependency),
+) -> Response:
+    counts = cached_building_counts() or await run(lambda service: service.organization_counts())
+    return cached_json_response(request, counts.json, counts.digest, settings.counts_cache_max_age)
+
+
+@router.get("/tiles/{zoom}/{x}/{y}", response_model=BuildingTileRead)
+async def building_tile(
+    request: Request,
+    zoom: int = Path(..., ge=0, le=22),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    run: ServiceRunner[BuildingService] = Depends(get_building_runner),
+    settings: Settings = Depends(get_settings_dependency),
+) -> Response:
+    """Buildings of a Web Mercator tile aggregated into at most TILE_CLUSTER_GRID² clusters."""
+    tile = cached_building_tile(zoom, x, y)
+    if tile is None:
+        try:
+            tile = await run(lambda service: service.building_tile(zoom, x, y))
+        except ValidationError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return cached_json_response(request, tile.json, tile.digest, settings.tiles_cache_max_age)
+
+
+@router.get("/{building_id}/organizations", response_model=OrganizationPage)
+async def organizations_in_building(
+    building_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    run: ServiceRunner[BuildingService] = Depends(get_building_runner),
 ):
     try:
-        return service.organizations_in_building(building_id)
+        return await run.render(
+            lambda service, serializer: serializer.page(service.organizations_in_building(building_id, limit, cursor))
+        )
     except NotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
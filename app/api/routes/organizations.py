@@ -1,24 +1,74 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import get_organization_service, require_api_key
-from app.schemas.organization import OrganizationRead
+from app.api.deps import ServiceRunner, get_organization_runner
+from app.api.streaming import organizations_ndjson
+from app.schemas.organization import (
+    OrganizationBatchRead,
+    OrganizationBatchRequest,
+    OrganizationNearbyRead,
+    OrganizationPage,
+    OrganizationRead,
+)
 from app.services.exceptions import NotFoundError, ValidationError
-from app.services.organization_service import OrganizationService
+from app.services.organization_service import OrganizationService, rectangle_bounds
 
-router = APIRouter(prefix="/organizations", tags=["organizations"], dependencies=[Depends(require_api_key)])
+router = APIRouter(prefix="/organizations", tags=["organizations"])
+
+
+@router.get("/", response_model=OrganizationPage)
+async def list_organizations(
+    building_id: int | None = Query(None),
+    activity_id: int | None = Query(None, description="Includes organizations of descendant activities"),
+    query: str | None = Query(None, min_length=2, description="Case insensitive substring for organization name"),
+    latitude: float | None = Query(None, ge=-90, le=90),
+    longitude: float | None = Query(None, ge=-180, le=180),
+    radius_km: float | None = Query(None, gt=0, description="Search radius in kilometers around latitude/longitude"),
+    min_latitude: float | None = Query(None, ge=-90, le=90),
+    max_latitude: float | None = Query(None, ge=-90, le=90),
+    min_longitude: float | None = Query(None, ge=-180, le=180),
+    max_longitude: float | None = Query(None, ge=-180, le=180),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    run: ServiceRunner[OrganizationService] = Depends(get_organization_runner),
+):
+    """Organizations matching every given filter, ordered by name and paginated like the other lists."""
+    try:
+        return await run.render(
+            lambda service, serializer: serializer.page(
+                service.list_organizations(
+                    building_id=building_id,
+                    activity_id=activity_id,
+                    query=query,
+                    latitude=latitude,
+                    longitude=longitude,
+                    radius_km=radius_km,
+                    min_latitude=min_latitude,
+                    max_latitude=max_latitude,
+                    min_longitude=min_longitude,
+                    max_longitude=max_longitude,
+                    limit=limit,
+                    cursor=cursor,
+                )
+            )
+        )
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @router.get("/search", response_model=list[OrganizationRead])
-def search_organizations(
+async def search_organizations(
     query: str = Query(..., min_length=2, description="Case insensitive substring for organization name"),
     limit: int = Query(50, ge=1, le=200),
-    service: OrganizationService = Depends(get_organization_service),
+    run: ServiceRunner[OrganizationService] = Depends(get_organization_runner),
 ):
-    return service.search_organizations(query, limit)
+    return await run.render(
+        lambda service, serializer: serializer.organizations(service.search_organizations(query, limit))
+    )
 
 
-@router.get("/nearby", response_model=list[OrganizationRead])
-def organizations_nearby(
+@router.get("/nearby", response_model=list[OrganizationNearbyRead])
+async def organizations_nearby(
     latitude: float = Query(..., ge=-90, le=90),
     longitude: float = Query(..., ge=-180, le=180),
     radius_km: float | None = Query(None, gt=0, description="Search radius in kilometers"),
@@ -27,29 +77,66 @@ def organizations_nearby(
     min_longitude: float | None = Query(None, ge=-180, le=180),
     max_longitude: float | None = Query(None, ge=-180, le=180),
     limit: int = Query(100, ge=1, le=500),
-    service: OrganizationService = Depends(get_organization_service),
+    run: ServiceRunner[OrganizationService] = Depends(get_organization_runner),
 ):
     try:
-        return service.organizations_nearby(
-            latitude=latitude,
-            longitude=longitude,
-            radius_km=radius_km,
-            min_latitude=min_latitude,
-            max_latitude=max_latitude,
-            min_longitude=min_longitude,
-            max_longitude=max_longitude,
-            limit=limit,
+        return await run.render(
+            lambda service, serializer: serializer.nearby(
+                service.organizations_nearby(
+                    latitude=latitude,
+                    longitude=longitude,
+                    radius_km=radius_km,
+                    min_latitude=min_latitude,
+                    max_latitude=max_latitude,
+                    min_longitude=min_longitude,
+                    max_longitude=max_longitude,
+                    limit=limit,
+                )
+            )
         )
     except ValidationError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
+@router.post("/batch", response_model=OrganizationBatchRead)
+async def get_organizations_batch(
+    payload: OrganizationBatchRequest,
+    run: ServiceRunner[OrganizationService] = Depends(get_organization_runner),
+):
+    return await run.render(lambda service, serializer: serializer.batch(*service.get_organizations(payload.ids)))
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}, "description": "One OrganizationRead per line"}},
+)
+async def export_organizations(
+    activity_id: int | None = Query(None, description="Only organizations in this activity or its descendants"),
+    min_latitude: float | None = Query(None, ge=-90, le=90),
+    max_latitude: float | None = Query(None, ge=-90, le=90),
+    min_longitude: float | None = Query(None, ge=-180, le=180),
+    max_longitude: float | None = Query(None, ge=-180, le=180),
+    batch_size: int = Query(500, ge=1, le=10_000, description="Rows fetched and flushed per chunk"),
+) -> StreamingResponse:
+    try:
+        bounds = rectangle_bounds(min_latitude, max_latitude, min_longitude, max_longitude)
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return StreamingResponse(
+        organizations_ndjson(activity_id=activity_id, bounds=bounds, batch_size=batch_size),
+        media_type="application/x-ndjson",
+    )
+
+
 @router.get("/{organization_id}", response_model=OrganizationRead)
-def get_organization(
+async def get_organization(
     organization_id: int,
-    service: OrganizationService = Depends(get_organization_service),
+    run: ServiceRunner[OrganizationService] = Depends(get_organization_runner),
 ):
     try:
-        return service.get_organization(organization_id)
+        return await run.render(
+            lambda service, serializer: serializer.organization(service.get_organization(organization_id))
+        )
     except NotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+
+from app.db import session as db_session
+from app.schemas.system import EnginePoolsRead, EntityCacheStatsRead
+from app.services.entity_cache import get_organization_cache
+
+router = APIRouter(prefix="/system", tags=["system"])
+
+
+@router.get("/pool", response_model=EnginePoolsRead)
+async def pool_stats() -> EnginePoolsRead:
+    """Pools of the engines this process has created; an engine not in use yet is ``null``."""
+    sync_engine, async_engine = db_session.created_engines()
+    return EnginePoolsRead(
+        sync_engine=db_session.pool_stats(sync_engine) if sync_engine is not None else None,
+        async_engine=db_session.pool_stats(async_engine.sync_engine) if async_engine is not None else None,
+    )
+
+
+@router.get("/cache", response_model=EntityCacheStatsRead | None)
+async def entity_cache_stats() -> EntityCacheStatsRead | None:
+    """Organization card cache metrics; ``null`` when ENTITY_CACHE_BACKEND is ``none``."""
+    cache = get_organization_cache()
+    if cache is None:
+        return None
+    stats = cache.stats
+    return EntityCacheStatsRead(
+        backend=cache.backend.name,
+        entries=cache.backend.size(),
+        hits=stats.hits,
+        misses=stats.misses,
+        coalesced=stats.coalesced,
+        invalidations=stats.invalidations,
+        errors=stats.errors,
+    )
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterable, Mapping
+from typing import Any
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.responses import json_dumps
+from app.dao import ActivityDAO, OrganizationDAO, OrganizationRecord
+from app.db import session as db_session
+from app.schemas.serializers import OrganizationSerializer
+from app.services.activity_service import load_activity_tree
+
+
+def _activity_payloads(db: Session) -> Mapping[int, dict[str, Any]]:
+    return load_activity_tree(ActivityDAO(db)).payloads
+
+
+def _ndjson(records: Iterable[OrganizationRecord], activities: Mapping[int, dict[str, Any]]) -> bytes:
+    # A fresh serializer per chunk keeps its building memo from growing with the export.
+    serializer = OrganizationSerializer(activities)
+    return b"".join(json_dumps(serializer.organization(record)) + b"\n" for record in records)
+
+
+async def organizations_ndjson(
+    *,
+    activity_id: int | None,
+    bounds: tuple[float, float, float, float] | None,
+    batch_size: int,
+) -> AsyncIterator[bytes]:
+    """Stream matching organizations as NDJSON from a server-side cursor, ``batch_size`` rows per chunk."""
+    # Request-scoped sessions are closed before a streaming body is sent, so the export opens its own.
+    async_sessions = db_session.get_async_sessionmaker()
+    if async_sessions is not None:
+        async with async_sessions() as db:
+            activities = await db.run_sync(_activity_payloads)
+            stmt = OrganizationDAO(db.sync_session, readonly=True).export_stmt(activity_id=activity_id, bounds=bounds)
+            result = await db.stream(stmt.execution_options(yield_per=batch_size))
+            async for rows in result.partitions():
+                yield _ndjson(OrganizationDAO.to_records(rows), activities)
+        return
+
+    db = db_session.get_sessionmaker()()
+    try:
+        activities = await run_in_threadpool(_activity_payloads, db)
+        dao = OrganizationDAO(db, readonly=True)
+        batches = dao.iter_record_batches(dao.export_stmt(activity_id=activity_id, bounds=bounds), batch_size)
+        try:
+            while (records := await run_in_threadpool(next, batches, None)) is not None:
+                yield _ndjson(records, activities)
+        finally:
+            await run_in_threadpool(batches.close)
+    finally:
+        await run_in_threadpool(db.close)
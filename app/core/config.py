@@ -1,14 +1,56 @@
 from functools import lru_cache
+from typing import Literal
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
 
+class ApiKeySettings(BaseModel):
+    name: str
+    key: str
+    rate_limit_per_second: float | None = Field(default=None, gt=0)
+    rate_limit_burst: int | None = Field(default=None, ge=1)
+
+
 class Settings(BaseSettings):
     database_url: str = Field(default="sqlite:///./app.db", alias="DATABASE_URL")
     api_key: str = Field(default="secret-api-key", alias="API_KEY")
+    api_keys: list[ApiKeySettings] = Field(default_factory=list, alias="API_KEYS")
+    rate_limit_per_second: float | None = Field(default=None, gt=0, alias="RATE_LIMIT_PER_SECOND")
+    rate_limit_burst: int | None = Field(default=None, ge=1, alias="RATE_LIMIT_BURST")
+    rate_limit_backend: Literal["memory", "redis"] = Field(default="memory", alias="RATE_LIMIT_BACKEND")
+    rate_limit_redis_url: str = Field(default="redis://localhost:6379/0", alias="RATE_LIMIT_REDIS_URL")
+    async_mode: bool = Field(default=False, alias="ASYNC_MODE")
+    db_pool_size: int = Field(default=5, ge=1, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, ge=0, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=30.0, gt=0, alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(default=-1, alias="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(default=False, alias="DB_POOL_PRE_PING")
+    db_statement_timeout_ms: int | None = Field(default=None, ge=1, alias="DB_STATEMENT_TIMEOUT_MS")
+    db_prepared_statement_cache_size: int = Field(default=100, ge=0, alias="DB_PREPARED_STATEMENT_CACHE_SIZE")
+    sqlite_journal_mode: str | None = Field(default="WAL", alias="SQLITE_JOURNAL_MODE")
+    sqlite_synchronous: str | None = Field(default="NORMAL", alias="SQLITE_SYNCHRONOUS")
+    sqlite_mmap_size: int | None = Field(default=268_435_456, ge=0, alias="SQLITE_MMAP_SIZE")
+    sqlite_cache_size: int | None = Field(default=-65_536, alias="SQLITE_CACHE_SIZE")
     api_prefix: str = "/api"
     project_name: str = "Organization Directory"
+    activities_cache_max_age: int = Field(default=60, ge=0, alias="ACTIVITIES_CACHE_MAX_AGE")
+    counts_cache_max_age: int = Field(default=60, ge=0, alias="COUNTS_CACHE_MAX_AGE")
+    read_snapshot_enabled: bool = Field(default=False, alias="READ_SNAPSHOT_ENABLED")
+    name_index_enabled: bool = Field(default=False, alias="NAME_INDEX_ENABLED")
+    search_backend: Literal["auto", "like", "fulltext"] = Field(default="auto", alias="SEARCH_BACKEND")
+    nearby_backend: Literal["memory", "database"] = Field(default="memory", alias="NEARBY_BACKEND")
+    spatial_index_cell_degrees: float = Field(default=0.05, gt=0, alias="SPATIAL_INDEX_CELL_DEGREES")
+    tile_cluster_grid: int = Field(default=8, ge=1, le=64, alias="TILE_CLUSTER_GRID")
+    tile_cache_max_entries: int = Field(default=4096, ge=1, alias="TILE_CACHE_MAX_ENTRIES")
+    tiles_cache_max_age: int = Field(default=60, ge=0, alias="TILES_CACHE_MAX_AGE")
+    profiling_enabled: bool = Field(default=False, alias="PROFILING_ENABLED")
+    entity_cache_backend: Literal["none", "memory", "redis"] = Field(default="none", alias="ENTITY_CACHE_BACKEND")
+    entity_cache_ttl: int = Field(default=300, ge=1, alias="ENTITY_CACHE_TTL")
+    entity_cache_max_entries: int = Field(default=10_000, ge=1, alias="ENTITY_CACHE_MAX_ENTRIES")
+    entity_cache_redis_url: str = Field(default="redis://localhost:6379/0", alias="ENTITY_CACHE_REDIS_URL")
+    web_concurrency: int | None = Field(default=None, ge=1, alias="WEB_CONCURRENCY")
+    data_version_poll_interval: float = Field(default=5.0, ge=0, alias="DATA_VERSION_POLL_INTERVAL")
 
     model_config = {
         "env_file": ".env",
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from math import asin, asinh, atan, atan2, cos, degrees, pi, radians, sin, sinh, sqrt, tan
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+EARTH_RADIUS_KM = 6371.0
+# Web Mercator tiles stop here, so the world is a square at zoom 0.
+MAX_MERCATOR_LATITUDE = 85.0511287798
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1_rad, lon1_rad, lat2_rad, lon2_rad = map(radians, [lat1, lon1, lat2, lon2])
+    dlat = lat2_rad - lat1_rad
+    dlon = lon2_rad - lon1_rad
+    a = sin(dlat / 2) ** 2 + cos(lat1_rad) * cos(lat2_rad) * sin(dlon / 2) ** 2
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    return EARTH_RADIUS_KM * c
+
+
+def approximate_bounding_box(lat: float, lon: float, radius_km: float) -> tuple[float, float, float, float]:
+    lat_delta = (radius_km / EARTH_RADIUS_KM) * 180 / 3.141592653589793
+    lon_delta = lat_delta / max(cos(radians(lat)), 0.000001)
+    return lat - lat_delta, lat + lat_delta, lon - lon_delta, lon + lon_delta
+
+
+def haversine_km_many(lat: float, lon: float, latitudes: Sequence[float], longitudes: Sequence[float]):
+    """Distances from one point to columns of points: an ndarray with numpy, otherwise a list."""
+    if np is not None:
+        lat_rad = np.radians(lat)
+        latitudes_rad = np.radians(np.asarray(latitudes, dtype=np.float64))
+        dlat = latitudes_rad - lat_rad
+        dlon = np.radians(np.asarray(longitudes, dtype=np.float64) - lon)
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat_rad) * np.cos(latitudes_rad) * np.sin(dlon / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    lat_rad = radians(lat)
+    cos_lat = cos(lat_rad)
+    distances = []
+    for other_lat, other_lon in zip(latitudes, longitudes):
+        other_lat_rad = radians(other_lat)
+        dlat = other_lat_rad - lat_rad
+        dlon = radians(other_lon - lon)
+        a = sin(dlat / 2) ** 2 + cos_lat * cos(other_lat_rad) * sin(dlon / 2) ** 2
+        distances.append(2 * EARTH_RADIUS_KM * asin(sqrt(min(a, 1.0))))
+    return distances
+
+
+def bounding_box_mask(
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+    min_latitude: float,
+    max_latitude: float,
+    min_longitude: float,
+    max_longitude: float,
+):
+    """Boolean mask of the points that fall inside the box (inclusive)."""
+    if np is not None:
+        lats = np.asarray(latitudes, dtype=np.float64)
+        lons = np.asarray(longitudes, dtype=np.float64)
+        return (lats >= min_latitude) & (lats <= max_latitude) & (lons >= min_longitude) & (lons <= max_longitude)
+
+    return [
+        min_latitude <= lat <= max_latitude and min_longitude <= lon <= max_longitude
+        for lat, lon in zip(latitudes, longitudes)
+    ]
+
+
+def tile_bounds(zoom: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """``(min_lat, max_lat, min_lon, max_lon)`` of a Web Mercator (slippy map) tile."""
+    tiles = 2**zoom
+
+    def latitude(row: float) -> float:
+        return degrees(atan(sinh(pi * (1 - 2 * row / tiles))))
+
+    return latitude(y + 1), latitude(y), x / tiles * 360 - 180, (x + 1) / tiles * 360 - 180
+
+
+def tile_coordinates(zoom: int, latitudes: Sequence[float], longitudes: Sequence[float]):
+    """Fractional tile ``(x, y)`` columns of points at ``zoom``; the integer part is the tile."""
+    tiles = 2**zoom
+    if np is not None:
+        lats = np.clip(np.asarray(latitudes, dtype=np.float64), -MAX_MERCATOR_LATITUDE, MAX_MERCATOR_LATITUDE)
+        xs = (np.asarray(longitudes, dtype=np.float64) + 180) / 360 * tiles
+        return xs, (1 - np.arcsinh(np.tan(np.radians(lats))) / pi) / 2 * tiles
+
+    xs = [(lon + 180) / 360 * tiles for lon in longitudes]
+    ys = [
+        (1 - asinh(tan(radians(max(-MAX_MERCATOR_LATITUDE, min(MAX_MERCATOR_LATITUDE, lat))))) / pi) / 2 * tiles
+        for lat in latitudes
+    ]
+    return xs, ys
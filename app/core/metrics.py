@@ -0,0 +1,73 @@
+"""Per-request timing collected while PROFILING_ENABLED is on."""
+
+from __future__ import annotations
+
+import cProfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import Engine, event
+
+_STARTED_KEY = "_metrics_started"
+
+
+class RequestMetrics:
+    __slots__ = ("queries", "db_seconds", "phases", "profile")
+
+    def __init__(self, profile: cProfile.Profile | None = None):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.phases: dict[str, float] = {}
+        self.profile = profile
+
+    def server_timing(self, total_seconds: float) -> str:
+        """``Server-Timing`` header value, durations in milliseconds."""
+        entries = [f'db;dur={self.db_seconds * 1000:.2f};desc="{self.queries} queries"']
+        entries.extend(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items())
+        entries.append(f"total;dur={total_seconds * 1000:.2f}")
+        return ", ".join(entries)
+
+
+current_metrics: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the block's Python time, database time excluded, to phase ``name``; a no-op outside a request."""
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+
+    started, db_started = time.perf_counter(), metrics.db_seconds
+    if metrics.profile is not None:
+        metrics.profile.enable()
+    try:
+        yield
+    finally:
+        if metrics.profile is not None:
+            metrics.profile.disable()
+        elapsed = time.perf_counter() - started - (metrics.db_seconds - db_started)
+        metrics.phases[name] = metrics.phases.get(name, 0.0) + elapsed
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and current_metrics.get() is not None:
+        setattr(context, _STARTED_KEY, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    metrics = current_metrics.get()
+    started = getattr(context, _STARTED_KEY, None) if context is not None else None
+    if metrics is not None and started is not None:
+        metrics.queries += 1
+        metrics.db_seconds += time.perf_counter() - started
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements and their time against the current request (pass ``AsyncEngine.sync_engine``)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,123 @@
+"""Minimal blocking client for the Redis serialization protocol (RESP2)."""
+
+from __future__ import annotations
+
+import socket
+import threading
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+
+class RespError(Exception):
+    """Error reply from the server."""
+
+
+class _Connection:
+    __slots__ = ("sock", "reader")
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.reader = sock.makefile("rb")
+
+    def close(self) -> None:
+        self.reader.close()
+        self.sock.close()
+
+
+def _encode(args: tuple[Any, ...]) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+def _read_reply(reader) -> Any:
+    line = reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed by server")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        raise RespError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = reader.read(length + 2)
+        if len(data) != length + 2:
+            raise ConnectionError("Connection closed by server")
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        return None if length < 0 else [_read_reply(reader) for _ in range(length)]
+    raise ConnectionError(f"Unexpected reply type {kind!r}")
+
+
+class RespClient:
+    """Thread-safe client with a small connection pool; ``url`` is ``redis://[:password@]host[:port][/db]``."""
+
+    def __init__(self, url: str, *, timeout: float = 0.5, max_idle: int = 8):
+        parts = urlsplit(url)
+        if parts.scheme != "redis":
+            raise ValueError(f"Unsupported cache URL scheme: {parts.scheme!r}")
+        self.address = (parts.hostname or "localhost", parts.port or 6379)
+        self.password = unquote(parts.password) if parts.password else None
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle: list[_Connection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> _Connection:
+        sock = socket.create_connection(self.address, timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection = _Connection(sock)
+        try:
+            if self.password is not None:
+                self._roundtrip(connection, ("AUTH", self.password))
+            if self.db:
+                self._roundtrip(connection, ("SELECT", self.db))
+        except BaseException:
+            connection.close()
+            raise
+        return connection
+
+    @staticmethod
+    def _roundtrip(connection: _Connection, args: tuple[Any, ...]) -> Any:
+        connection.sock.sendall(_encode(args))
+        return _read_reply(connection.reader)
+
+    def execute(self, *args: Any) -> Any:
+        with self._lock:
+            connection = self._idle.pop() if self._idle else None
+        if connection is None:
+            connection = self._connect()
+        try:
+            reply = self._roundtrip(connection, args)
+        except RespError:
+            self._release(connection)
+            raise
+        except BaseException:
+            # The stream position is unknown after a transport error; never reuse it.
+            connection.close()
+            raise
+        self._release(connection)
+        return reply
+
+    def _release(self, connection: _Connection) -> None:
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
@@ -0,0 +1,120 @@
+"""gunicorn hooks: workers forked from a pre-warmed master, reloaded when the stored data versions move."""
+
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import signal
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import NullPool
+
+from app.core.config import Settings
+from app.db.versioning import TABLE_SCOPES, data_versions, read_stored_versions
+
+logger = logging.getLogger(__name__)
+
+
+def worker_count(settings: Settings) -> int:
+    """WEB_CONCURRENCY, or one worker per CPU available to this process (containers may get fewer than the host)."""
+    if settings.web_concurrency:
+        return settings.web_concurrency
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - not available on macOS
+        return os.cpu_count() or 1
+
+
+def warm_up_master(settings: Settings) -> None:
+    """Build the read structures in the master before forking; on failure the workers warm up themselves."""
+    from app.db import session as db_session
+    from app.services.warmup import warm_up
+
+    try:
+        with db_session.get_sessionmaker()() as db:
+            warm_up(db, settings)
+    except Exception:
+        logger.exception("Warm-up in the master failed, leaving it to the workers")
+    finally:
+        # Workers must open their own connections instead of inheriting the master's.
+        db_session.get_engine().dispose()
+        # Keep collections in the workers from writing to (and copying) the shared pages.
+        gc.freeze()
+
+
+class DataVersionWatcher:
+    """Polls the persisted data versions and signals the master when any of them moves."""
+
+    def __init__(self, database_url: str, interval: float):
+        self.interval = interval
+        # No pooled connection may outlive a poll: a forked worker would inherit it.
+        self.engine = create_engine(database_url, poolclass=NullPool)
+        self.seen: dict[str, int] | None = None
+        self.pending: set[str] = set()
+        self.lock = threading.Lock()
+        # Forks wait for a running poll, so no child is born mid-query.
+        os.register_at_fork(
+            before=self.lock.acquire, after_in_parent=self.lock.release, after_in_child=self.lock.release
+        )
+
+    def poll(self) -> set[str]:
+        """Scopes whose persisted version changed since the previous poll."""
+        with self.lock:
+            with self.engine.connect() as connection:
+                versions = read_stored_versions(connection)
+            seen, self.seen = self.seen, versions
+            if seen is None:
+                return set()
+            changed = {scope for scope in versions.keys() | seen.keys() if versions.get(scope) != seen.get(scope)}
+            self.pending |= changed
+            return changed
+
+    def take_changes(self) -> set[str]:
+        with self.lock:
+            changed, self.pending = self.pending, set()
+            return changed
+
+    def run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                changed = self.poll()
+            except SQLAlchemyError:
+                # The database may be restarting; the next poll tries again.
+                continue
+            if changed:
+                os.kill(os.getpid(), signal.SIGHUP)
+
+    def start(self) -> None:
+        threading.Thread(target=self.run, name="data-version-watcher", daemon=True).start()
+
+
+_watcher: DataVersionWatcher | None = None
+
+
+def on_master_ready(settings: Settings) -> None:
+    """gunicorn ``when_ready``: warm up, then start watching for data changes."""
+    global _watcher
+    warm_up_master(settings)
+    if settings.data_version_poll_interval and _watcher is None:
+        _watcher = DataVersionWatcher(settings.database_url, settings.data_version_poll_interval)
+        _watcher.poll()
+        _watcher.start()
+
+
+def on_master_reload(settings: Settings) -> None:
+    """gunicorn ``on_reload``: rebuild what changed (everything on a manual SIGHUP) before forking."""
+    from app.services.entity_cache import clear_shared_organization_cache
+
+    changed = _watcher.take_changes() if _watcher is not None else set()
+    changed = changed or set(TABLE_SCOPES.values())
+    data_versions.bump(*changed)
+    if changed & {"organizations", "buildings"}:
+        # Cards embed their building; the writer may have been a script that never touched the shared cache.
+        clear_shared_organization_cache(settings)
+    gc.unfreeze()
+    warm_up_master(settings)
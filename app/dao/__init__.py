@@ -1,9 +1,18 @@
 from app.dao.activity import ActivityDAO
 from app.dao.building import BuildingDAO
 from app.dao.organization import OrganizationDAO
+from app.dao.planner import OrganizationFilters
+from app.dao.records import ActivityRecord, BuildingRecord, OrganizationRecord, OrganizationResult
+from app.dao.snapshot import DirectorySnapshot
 
 __all__ = [
     "ActivityDAO",
+    "ActivityRecord",
     "BuildingDAO",
+    "BuildingRecord",
+    "DirectorySnapshot",
     "OrganizationDAO",
+    "OrganizationFilters",
+    "OrganizationRecord",
+    "OrganizationResult",
 ]
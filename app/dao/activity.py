@@ -1,7 +1,7 @@
-from sqlalchemy import func, select
+from sqlalchemy import Connection, delete, distinct, func, insert, literal, select
 from sqlalchemy.orm import Session
 
-from app.models import Activity
+from app.models import Activity, ActivityClosure, organization_activities
 
 
 class ActivityDAO:
@@ -18,3 +18,32 @@ class ActivityDAO:
     def find_by_name(self, name: str) -> Activity | None:
         stmt = select(Activity).where(func.lower(Activity.name) == func.lower(name.strip()))
         return self.db.scalar(stmt)
+
+    def organization_counts(self) -> dict[int, int]:
+        """Distinct organizations per activity, rolled up over its subtree; zero for empty activities."""
+        stmt = (
+            select(ActivityClosure.ancestor_id, func.count(distinct(organization_activities.c.organization_id)))
+            .outerjoin(organization_activities, organization_activities.c.activity_id == ActivityClosure.descendant_id)
+            .group_by(ActivityClosure.ancestor_id)
+            .order_by(ActivityClosure.ancestor_id)
+        )
+        return {node_id: count for node_id, count in self.db.execute(stmt)}
+
+
+def rebuild_activity_closure(connection: Connection) -> None:
+    """Recompute ``activity_closure`` from ``activities.parent_id`` with one recursive CTE."""
+    closure = select(
+        Activity.id.label("ancestor_id"), Activity.id.label("descendant_id"), literal(0).label("depth")
+    ).cte("closure", recursive=True)
+    closure = closure.union_all(
+        select(closure.c.ancestor_id, Activity.id, closure.c.depth + 1).join(
+            Activity, Activity.parent_id == closure.c.descendant_id
+        )
+    )
+    connection.execute(delete(ActivityClosure))
+    connection.execute(
+        insert(ActivityClosure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(closure.c.ancestor_id, closure.c.descendant_id, closure.c.depth),
+        )
+    )
@@ -1,5 +1,5 @@
-from sqlalchemy import select
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
 from app.models import Building, Organization
 
@@ -15,15 +15,16 @@ class BuildingDAO:
     def get(self, building_id: int) -> Building | None:
         return self.db.get(Building, building_id)
 
-    def organizations_in_building(self, building_id: int) -> list[Organization]:
+    def list_coordinates(self) -> list[tuple[int, float, float]]:
+        stmt = select(Building.id, Building.latitude, Building.longitude)
+        return [tuple(row) for row in self.db.execute(stmt)]
+
+    def organization_counts(self) -> dict[int, int]:
+        """Organizations per building in one grouped query, zero for empty buildings."""
         stmt = (
-            select(Organization)
-            .options(
-                selectinload(Organization.activities),
-                selectinload(Organization.phones),
-                selectinload(Organization.building),
-            )
-            .where(Organization.building_id == building_id)
-            .order_by(Organization.name)
+            select(Building.id, func.count(Organization.id))
+            .outerjoin(Organization, Organization.building_id == Building.id)
+            .group_by(Building.id)
+            .order_by(Building.id)
         )
-        return list(self.db.scalars(stmt).all())
+        return {node_id: count for node_id, count in self.db.execute(stmt)}
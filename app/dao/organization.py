@@ -1,14 +1,35 @@
-from sqlalchemy import Select, func, select
-from sqlalchemy.orm import Session, selectinload
+from collections.abc import Iterable, Iterator
 
-from app.models import Activity, Building, Organization
+from sqlalchemy import JSON, ColumnElement, Row, ScalarSelect, Select, case, func, select, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session, aliased, selectinload
+
+from app.models import ActivityClosure, Building, Organization, OrganizationPhone, organization_activities
+from app.core.config import get_settings
+from app.core.geo import EARTH_RADIUS_KM, approximate_bounding_box
+from app.dao.planner import (
+    CIRCLE_IN_BOX,
+    QUERY_SELECTIVITY,
+    FilterPlan,
+    OrganizationFilters,
+    Predicate,
+    choose_plan,
+    planner_stats,
+)
+from app.dao.records import BuildingRecord, OrganizationRecord, OrganizationResult
+from app.dao.search import get_search_backend, name_contains
 
 
 class OrganizationDAO:
-    def __init__(self, db: Session):
+    """Organization queries; ``readonly=True`` returns projected ``OrganizationRecord`` rows instead of entities."""
+
+    def __init__(self, db: Session, *, readonly: bool = False):
         self.db = db
+        self.readonly = readonly
 
-    def _base_stmt(self) -> Select[Organization]:
+    def _base_stmt(self) -> Select:
+        if self.readonly:
+            return self._record_stmt()
         return (
             select(Organization)
             .options(
@@ -16,47 +37,307 @@ class OrganizationDAO:
                 selectinload(Organization.phones),
                 selectinload(Organization.building),
             )
+            .order_by(Organization.name)
+        )
+
+    def _record_stmt(self) -> Select:
+        return (
+            select(
+                Organization.id,
+                Organization.name,
+                Organization.building_id,
+                Organization.created_at,
+                Building.address,
+                Building.latitude,
+                Building.longitude,
+                Building.created_at.label("building_created_at"),
+                self._json_array(
+                    OrganizationPhone.phone_number,
+                    OrganizationPhone.id,
+                    OrganizationPhone.organization_id == Organization.id,
+                ).label("phone_numbers"),
+                self._json_array(
+                    organization_activities.c.activity_id,
+                    organization_activities.c.activity_id,
+                    organization_activities.c.organization_id == Organization.id,
+                ).label("activity_ids"),
+            )
             .join(Organization.building)
             .order_by(Organization.name)
         )
 
-    def get(self, organization_id: int) -> Organization | None:
+    def _json_array(self, column: ColumnElement, order_by: ColumnElement, *criteria) -> ScalarSelect:
+        """Correlated subquery aggregating ``column`` over ``criteria`` into a JSON array sorted by ``order_by``."""
+        if self.db.get_bind().dialect.name == "postgresql":
+            aggregate = func.json_agg(aggregate_order_by(column, order_by), type_=JSON)
+            return select(aggregate).where(*criteria).scalar_subquery()
+
+        # json_group_array only takes ORDER BY from SQLite 3.44 on; it keeps the order of an ordered subquery.
+        ordered = select(column).where(*criteria).order_by(order_by).correlate(Organization).subquery()
+        return select(func.json_group_array(ordered.c[0], type_=JSON)).scalar_subquery()
+
+    def _fetch(self, stmt: Select) -> list[OrganizationResult]:
+        if not self.readonly:
+            return list(self.db.scalars(stmt).all())
+        return self.to_records(self.db.execute(stmt))
+
+    @staticmethod
+    def to_records(rows: Iterable[Row]) -> list[OrganizationRecord]:
+        """Build records from rows of the read-only projection (see ``export_stmt``)."""
+        buildings: dict[int, BuildingRecord] = {}
+        records = []
+        for row in rows:
+            building = buildings.get(row.building_id)
+            if building is None:
+                building = buildings[row.building_id] = BuildingRecord(
+                    row.building_id, row.address, row.latitude, row.longitude, row.building_created_at
+                )
+            records.append(
+                OrganizationRecord(
+                    row.id,
+                    row.name,
+                    row.building_id,
+                    row.created_at,
+                    building,
+                    # json_agg yields NULL rather than [] when there is nothing to aggregate.
+                    tuple(row.phone_numbers or ()),
+                    tuple(row.activity_ids or ()),
+                )
+            )
+        return records
+
+    def get(self, organization_id: int) -> OrganizationResult | None:
         stmt = self._base_stmt().where(Organization.id == organization_id)
-        return self.db.scalar(stmt)
+        found = self._fetch(stmt)
+        return found[0] if found else None
 
-    def search_by_name(self, query: str, limit: int) -> list[Organization]:
-        normalized = query.strip()
+    def search_by_name(self, query: str, limit: int) -> list[OrganizationResult]:
+        """The ``limit`` best matches by relevance; not keyset-paged, since the order is not ``(name, id)``."""
+        backend = get_search_backend(self.db, get_settings().search_backend)
+        return self.list_by_ids(backend.search_ids(self.db, query.strip(), limit))
+
+    def list_names(self, organization_ids: list[int] | None = None) -> list[tuple[int, str]]:
+        stmt = select(Organization.id, Organization.name)
+        if organization_ids is not None:
+            stmt = stmt.where(Organization.id.in_(organization_ids))
+        return [tuple(row) for row in self.db.execute(stmt)]
+
+    def list_by_building(
+        self, building_id: int, *, limit: int, after: tuple[str, int] | None = None
+    ) -> list[OrganizationResult]:
+        stmt = self._base_stmt().where(Organization.building_id == building_id)
+        return self._keyset_page(stmt, limit, after)
+
+    def list_by_building_ids(self, building_ids: list[int], *, limit: int) -> list[OrganizationResult]:
+        """The first ``limit`` organizations of the buildings, in the order given and by name within a building."""
+        ranks = {building_id: rank for rank, building_id in enumerate(building_ids)}
+        rank = case(ranks, value=Organization.building_id)
         stmt = (
             self._base_stmt()
-            .where(func.lower(Organization.name).contains(func.lower(normalized)))
+            .where(Organization.building_id.in_(building_ids))
+            .order_by(None)
+            .order_by(rank, Organization.name, Organization.id)
             .limit(limit)
         )
-        return list(self.db.scalars(stmt).all())
+        return self._fetch(stmt)
 
-    def list_by_building(self, building_id: int) -> list[Organization]:
-        stmt = self._base_stmt().where(Organization.building_id == building_id)
-        return list(self.db.scalars(stmt).all())
+    def list_by_activity_subtree(
+        self, activity_id: int, *, limit: int, after: tuple[str, int] | None = None
+    ) -> list[OrganizationResult]:
+        stmt = self._base_stmt().where(self._in_activity_subtree(activity_id))
+        return self._keyset_page(stmt, limit, after)
+
+    @staticmethod
+    def _activity_subtree_ids(activity_id: int) -> Select:
+        return (
+            select(organization_activities.c.organization_id)
+            .join(ActivityClosure, ActivityClosure.descendant_id == organization_activities.c.activity_id)
+            .where(ActivityClosure.ancestor_id == activity_id)
+        )
+
+    @classmethod
+    def _in_activity_subtree(cls, activity_id: int) -> ColumnElement[bool]:
+        return Organization.id.in_(cls._activity_subtree_ids(activity_id))
+
+    def _filter_predicates(self, filters: OrganizationFilters) -> list[Predicate]:
+        """Each filter as an index-driving form and a residual form that cannot become the access path."""
+        stats = planner_stats(self.db)
+        total = stats.organizations
+        predicates = []
+        if filters.building_id is not None:
+            predicates.append(
+                Predicate(
+                    "building",
+                    total / max(stats.buildings, 1),
+                    Organization.building_id == filters.building_id,
+                    Organization.building_id + 0 == filters.building_id,
+                )
+            )
+        if filters.activity_id is not None:
+            subtree = self._activity_subtree_ids(filters.activity_id)
+            predicates.append(
+                Predicate(
+                    "activity",
+                    stats.activity_counts.get(filters.activity_id, 0),
+                    Organization.id.in_(subtree),
+                    subtree.where(organization_activities.c.organization_id == Organization.id).exists(),
+                )
+            )
+        if filters.query is not None:
+            estimate = total * QUERY_SELECTIVITY ** max(len(filters.query) - 2, 1)
+            matches = get_search_backend(self.db, get_settings().search_backend).match_ids(filters.query)
+            if matches is None:
+                predicates.append(Predicate("query", estimate, None, name_contains(filters.query)))
+            else:
+                # Probing a full-text index row by row re-runs the match, so the residual reuses the id set.
+                predicates.append(
+                    Predicate("query", estimate, Organization.id.in_(matches), (Organization.id + 0).in_(matches))
+                )
+
+        areas = []
+        if filters.bounds is not None:
+            areas.append(("bounds", filters.bounds, 1.0, None))
+        if filters.radius is not None:
+            latitude, longitude, radius_km = filters.radius
+            areas.append(
+                ("radius", approximate_bounding_box(latitude, longitude, radius_km), CIRCLE_IN_BOX, filters.radius)
+            )
+        for name, box, share, radius in areas:
+            predicates.append(
+                Predicate(
+                    name,
+                    total * stats.area_fraction(box) * share,
+                    Organization.building_id.in_(self._buildings_within(Building, box, radius)),
+                    # Aliased so it never correlates to the building joined by the record projection.
+                    self._buildings_within(aliased(Building), box, radius, correlated=True).exists(),
+                )
+            )
+        return predicates
+
+    def _buildings_within(
+        self,
+        building,
+        box: tuple[float, float, float, float],
+        radius: tuple[float, float, float] | None,
+        *,
+        correlated: bool = False,
+    ) -> Select:
+        min_latitude, max_latitude, min_longitude, max_longitude = box
+        stmt = select(building.id).where(
+            building.latitude >= min_latitude,
+            building.latitude <= max_latitude,
+            building.longitude >= min_longitude,
+            building.longitude <= max_longitude,
+        )
+        if radius is not None:
+            latitude, longitude, radius_km = radius
+            stmt = stmt.where(self._distance_km(latitude, longitude, building) <= radius_km)
+        if correlated:
+            stmt = stmt.where(building.id == Organization.building_id)
+        return stmt
+
+    def plan_filters(self, filters: OrganizationFilters, limit: int) -> FilterPlan:
+        """Order the filters by estimated selectivity and pick what drives the query (see ``app.dao.planner``)."""
+        return choose_plan(self._filter_predicates(filters), planner_stats(self.db).organizations, limit)
 
-    def list_by_activity_ids(self, activity_ids: list[int]) -> list[Organization]:
-        stmt = self._base_stmt().where(Organization.activities.any(Activity.id.in_(activity_ids)))
-        return list(self.db.scalars(stmt).all())
+    def list_filtered(
+        self, filters: OrganizationFilters, *, limit: int, after: tuple[str, int] | None = None
+    ) -> list[OrganizationResult]:
+        """One page of organizations matching every filter, as a single statement in ``(name, id)`` order."""
+        stmt = self._base_stmt().where(*self.plan_filters(filters, limit).where())
+        return self._keyset_page(stmt, limit, after)
 
-    def list_in_rectangle(
+    def export_stmt(
         self,
+        *,
+        activity_id: int | None = None,
+        bounds: tuple[float, float, float, float] | None = None,
+    ) -> Select:
+        """Read-only projection of the matching organizations in id order, for streaming through ``to_records``."""
+        stmt = self._record_stmt().order_by(None).order_by(Organization.id)
+        if activity_id is not None:
+            stmt = stmt.where(self._in_activity_subtree(activity_id))
+        if bounds is not None:
+            min_latitude, max_latitude, min_longitude, max_longitude = bounds
+            stmt = stmt.where(
+                Building.latitude >= min_latitude,
+                Building.latitude <= max_latitude,
+                Building.longitude >= min_longitude,
+                Building.longitude <= max_longitude,
+            )
+        return stmt
+
+    def iter_record_batches(self, stmt: Select, batch_size: int) -> Iterator[list[OrganizationRecord]]:
+        """Run ``stmt`` on a server-side cursor and yield records ``batch_size`` rows at a time."""
+        result = self.db.execute(stmt.execution_options(yield_per=batch_size))
+        try:
+            for rows in result.partitions():
+                yield self.to_records(rows)
+        finally:
+            result.close()
+
+    def _keyset_page(
+        self, stmt: Select, limit: int, after: tuple[str, int] | None
+    ) -> list[OrganizationResult]:
+        """Apply ``(name, id)`` keyset pagination: rows strictly after ``after``, at most ``limit``."""
+        if after is not None:
+            stmt = stmt.where(tuple_(Organization.name, Organization.id) > tuple_(*after))
+        stmt = stmt.order_by(None).order_by(Organization.name, Organization.id).limit(limit)
+        return self._fetch(stmt)
+
+    def list_nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        *,
         min_latitude: float,
         max_latitude: float,
         min_longitude: float,
         max_longitude: float,
+        radius_km: float | None,
         limit: int,
-    ) -> list[Organization]:
+    ) -> list[tuple[OrganizationResult, float]]:
+        """Organizations inside the box (and radius), nearest first, with their distance in km."""
+        distance = self._distance_km(latitude, longitude).label("distance_km")
         stmt = (
-            self._base_stmt()
+            select(Organization.id, distance)
+            .join(Building, Organization.building_id == Building.id)
             .where(
                 Building.latitude >= min_latitude,
                 Building.latitude <= max_latitude,
                 Building.longitude >= min_longitude,
                 Building.longitude <= max_longitude,
             )
+            .order_by(distance, Organization.name)
             .limit(limit)
         )
-        return list(self.db.scalars(stmt).all())
+        if radius_km is not None:
+            stmt = stmt.where(self._distance_km(latitude, longitude) <= radius_km)
+
+        distances = {organization_id: distance_km for organization_id, distance_km in self.db.execute(stmt)}
+        organizations = self.list_by_ids(list(distances))
+        return [(organization, distances[organization.id]) for organization in organizations]
+
+    def get_many(self, organization_ids: list[int]) -> dict[int, OrganizationResult]:
+        """Load organizations by id with one statement (plus eager loads in entity mode), keyed by id."""
+        if not organization_ids:
+            return {}
+        stmt = self._base_stmt().where(Organization.id.in_(set(organization_ids)))
+        return {organization.id: organization for organization in self._fetch(stmt)}
+
+    def list_by_ids(self, organization_ids: list[int]) -> list[OrganizationResult]:
+        """Eager-load organizations in the order of ``organization_ids``, skipping unknown ids."""
+        by_id = self.get_many(organization_ids)
+        return [by_id[organization_id] for organization_id in organization_ids if organization_id in by_id]
+
+    def _distance_km(self, latitude: float, longitude: float, building=Building) -> ColumnElement[float]:
+        if self.db.get_bind().dialect.name == "sqlite":
+            # Registered on connect in app.db.session.
+            return func.haversine_km(latitude, longitude, building.latitude, building.longitude)
+
+        half_dlat = func.radians(building.latitude - latitude) / 2.0
+        half_dlon = func.radians(building.longitude - longitude) / 2.0
+        a = func.power(func.sin(half_dlat), 2) + func.cos(func.radians(latitude)) * func.cos(
+            func.radians(building.latitude)
+        ) * func.power(func.sin(half_dlon), 2)
+        return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(func.least(a, 1.0)))
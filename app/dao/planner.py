@@ -0,0 +1,144 @@
+"""Cost-based ordering of combined organization filters."""
+
+from __future__ import annotations
+
+from math import pi, prod
+
+from sqlalchemy import ColumnElement, Engine, func, select
+from sqlalchemy.orm import Session
+
+from app.dao.activity import ActivityDAO
+from app.db.versioning import data_versions
+from app.models import Building, Organization
+
+# Share of names matched by a substring of three characters; each further character divides it by ten.
+QUERY_SELECTIVITY = 0.1
+# Share of a radius search's bounding box covered by the circle itself.
+CIRCLE_IN_BOX = pi / 4
+
+
+class OrganizationFilters:
+    """Filters of the combined organization query; ``None`` means not filtered."""
+
+    __slots__ = ("building_id", "activity_id", "query", "bounds", "radius")
+
+    def __init__(
+        self,
+        *,
+        building_id: int | None = None,
+        activity_id: int | None = None,
+        query: str | None = None,
+        bounds: tuple[float, float, float, float] | None = None,
+        radius: tuple[float, float, float] | None = None,
+    ):
+        self.building_id = building_id
+        self.activity_id = activity_id
+        self.query = query
+        self.bounds = bounds
+        self.radius = radius
+
+
+class PlannerStats:
+    __slots__ = ("organizations", "buildings", "extent", "activity_counts")
+
+    def __init__(
+        self,
+        organizations: int,
+        buildings: int,
+        extent: tuple[float, float, float, float] | None,
+        activity_counts: dict[int, int],
+    ):
+        self.organizations = organizations
+        self.buildings = buildings
+        self.extent = extent
+        self.activity_counts = activity_counts
+
+    def area_fraction(self, bounds: tuple[float, float, float, float]) -> float:
+        """Share of the buildings' extent covered by ``bounds``, assuming buildings are spread evenly."""
+        if self.extent is None:
+            return 0.0
+        min_latitude, max_latitude, min_longitude, max_longitude = self.extent
+        overlap_latitude = min(bounds[1], max_latitude) - max(bounds[0], min_latitude)
+        overlap_longitude = min(bounds[3], max_longitude) - max(bounds[2], min_longitude)
+        if overlap_latitude < 0 or overlap_longitude < 0:
+            return 0.0
+        # A degenerate extent (all buildings on one line or point) still has some width.
+        span_latitude = max(max_latitude - min_latitude, 1e-6)
+        span_longitude = max(max_longitude - min_longitude, 1e-6)
+        return min(1.0, max(overlap_latitude, 1e-6) / span_latitude * max(overlap_longitude, 1e-6) / span_longitude)
+
+
+_stats: dict[Engine, tuple[tuple[int, ...], PlannerStats]] = {}
+
+
+def planner_stats(db: Session) -> PlannerStats:
+    """Table sizes, building extent and rolled-up activity counts, refreshed after writes."""
+    engine = db.get_bind()
+    version = tuple(data_versions.current(scope) for scope in ("activities", "buildings", "organizations"))
+    entry = _stats.get(engine)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    organizations = db.scalar(select(func.count()).select_from(Organization)) or 0
+    buildings, min_latitude, max_latitude, min_longitude, max_longitude = db.execute(
+        select(
+            func.count(),
+            func.min(Building.latitude),
+            func.max(Building.latitude),
+            func.min(Building.longitude),
+            func.max(Building.longitude),
+        )
+    ).one()
+    extent = (min_latitude, max_latitude, min_longitude, max_longitude) if buildings else None
+    stats = PlannerStats(organizations, buildings, extent, ActivityDAO(db).organization_counts())
+    _stats[engine] = (version, stats)
+    return stats
+
+
+class Predicate:
+    """One filter in two forms: ``driver`` may use an index (``None`` if none can), ``residual`` must not."""
+
+    __slots__ = ("name", "estimate", "driver", "residual")
+
+    def __init__(
+        self, name: str, estimate: float, driver: ColumnElement[bool] | None, residual: ColumnElement[bool]
+    ):
+        self.name = name
+        self.estimate = estimate
+        self.driver = driver
+        self.residual = residual
+
+
+class FilterPlan:
+    """Predicates in evaluation order; ``driver`` is ``None`` when the name index drives the scan."""
+
+    __slots__ = ("driver", "predicates", "estimate")
+
+    def __init__(self, driver: Predicate | None, predicates: list[Predicate], estimate: float):
+        self.driver = driver
+        self.predicates = predicates
+        self.estimate = estimate
+
+    def where(self) -> list[ColumnElement[bool]]:
+        return [
+            predicate.driver if predicate is self.driver else predicate.residual for predicate in self.predicates
+        ]
+
+    def describe(self) -> str:
+        names = [predicate.name for predicate in self.predicates if predicate is not self.driver]
+        return f"{self.driver.name if self.driver else 'name order'} -> {', '.join(names) or '-'}"
+
+
+def choose_plan(predicates: list[Predicate], total: int, limit: int) -> FilterPlan:
+    """Pick the cheaper of the best index-driven plan and a name-ordered scan for ``limit`` rows."""
+    predicates = sorted(predicates, key=lambda predicate: predicate.estimate)
+    total = max(total, 1)
+    combined = total * prod(min(predicate.estimate / total, 1.0) for predicate in predicates)
+    if not predicates:
+        return FilterPlan(None, [], combined)
+
+    scan_cost = min(total, limit * total / max(combined, 1.0))
+    driver = next((predicate for predicate in predicates if predicate.driver is not None), None)
+    if driver is None or scan_cost < driver.estimate:
+        return FilterPlan(None, predicates, combined)
+    return FilterPlan(driver, [driver, *(predicate for predicate in predicates if predicate is not driver)], combined)
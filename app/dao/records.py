@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Union
+
+from app.models import Organization
+
+
+class ActivityRecord:
+    """Read-only activity columns, enough to build the activity tree."""
+
+    __slots__ = ("id", "name", "parent_id", "level")
+
+    def __init__(self, id: int, name: str, parent_id: int | None, level: int):
+        self.id = id
+        self.name = name
+        self.parent_id = parent_id
+        self.level = level
+
+
+class BuildingRecord:
+    """Read-only building columns as returned by projected organization queries."""
+
+    __slots__ = ("id", "address", "latitude", "longitude", "created_at")
+
+    def __init__(self, id: int, address: str, latitude: float, longitude: float, created_at: datetime):
+        self.id = id
+        self.address = address
+        self.latitude = latitude
+        self.longitude = longitude
+        self.created_at = created_at
+
+
+class OrganizationRecord:
+    """Untracked organization row with its building, phone numbers and activity ids inlined."""
+
+    __slots__ = ("id", "name", "building_id", "created_at", "building", "phone_numbers", "activity_ids")
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        building_id: int,
+        created_at: datetime,
+        building: BuildingRecord,
+        phone_numbers: tuple[str, ...],
+        activity_ids: tuple[int, ...],
+    ):
+        self.id = id
+        self.name = name
+        self.building_id = building_id
+        self.created_at = created_at
+        self.building = building
+        self.phone_numbers = phone_numbers
+        self.activity_ids = activity_ids
+
+
+# What OrganizationDAO list methods return, depending on its ``readonly`` flag.
+OrganizationResult = Union[Organization, OrganizationRecord]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+from sqlalchemy import ColumnElement, Engine, Integer, Select, TextualSelect, column, func, select, text
+from sqlalchemy.orm import Session
+
+from app.models import Organization
+
+
+class OrganizationSearchBackend(Protocol):
+    def search_ids(self, db: Session, query: str, limit: int) -> list[int]:
+        """Ids of organizations whose name contains ``query``, most relevant first."""
+
+    def match_ids(self, query: str) -> Select | TextualSelect | None:
+        """Unordered, index-backed subquery of the matching ids, or ``None`` when ``query`` cannot use the index."""
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def name_contains(query: str) -> ColumnElement[bool]:
+    """Case insensitive substring match on the organization name."""
+    return func.lower(Organization.name).contains(func.lower(_escape_like(query)), escape="\\")
+
+
+class LikeSearchBackend:
+    """Portable fallback: substring scan ordered by name."""
+
+    def search_ids(self, db: Session, query: str, limit: int) -> list[int]:
+        stmt = select(Organization.id).where(name_contains(query)).order_by(Organization.name).limit(limit)
+        return list(db.scalars(stmt))
+
+    def match_ids(self, query: str) -> Select | None:
+        return None
+
+
+class SqliteFtsSearchBackend:
+    """FTS5 ``trigram`` table maintained by triggers (see the organization search migration)."""
+
+    min_query_length = 3
+
+    def __init__(self) -> None:
+        self._fallback = LikeSearchBackend()
+
+    def search_ids(self, db: Session, query: str, limit: int) -> list[int]:
+        if len(query) < self.min_query_length:
+            return self._fallback.search_ids(db, query, limit)
+        # A quoted FTS5 string matches the query as a substring of the name.
+        phrase = '"' + query.replace('"', '""') + '"'
+        stmt = text(
+            "SELECT organizations_fts.rowid FROM organizations_fts "
+            "WHERE organizations_fts MATCH :phrase "
+            "ORDER BY organizations_fts.rank, organizations_fts.name LIMIT :limit"
+        )
+        return list(db.scalars(stmt, {"phrase": phrase, "limit": limit}))
+
+    def match_ids(self, query: str) -> TextualSelect | None:
+        if len(query) < self.min_query_length:
+            return None
+        phrase = '"' + query.replace('"', '""') + '"'
+        return (
+            text("SELECT rowid FROM organizations_fts WHERE organizations_fts MATCH :phrase")
+            .bindparams(phrase=phrase)
+            .columns(column("rowid", Integer))
+        )
+
+
+class PostgresTrigramSearchBackend:
+    """``pg_trgm`` GIN index on ``lower(name)``; ranked by trigram similarity."""
+
+    # Trigram indexes only help patterns of three characters or more.
+    min_query_length = 3
+
+    def search_ids(self, db: Session, query: str, limit: int) -> list[int]:
+        lowered = func.lower(query)
+        stmt = (
+            select(Organization.id)
+            .where(name_contains(query))
+            .order_by(
+                func.similarity(func.lower(Organization.name), lowered).desc(),
+                Organization.name,
+            )
+            .limit(limit)
+        )
+        return list(db.scalars(stmt))
+
+    def match_ids(self, query: str) -> Select | None:
+        if len(query) < self.min_query_length:
+            return None
+        return select(Organization.id).where(name_contains(query))
+
+
+_PROBES = {
+    "sqlite": (
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'organizations_fts'",
+        SqliteFtsSearchBackend,
+    ),
+    "postgresql": (
+        "SELECT 1 FROM pg_indexes WHERE indexname = 'ix_organizations_name_trgm'",
+        PostgresTrigramSearchBackend,
+    ),
+}
+_detected: dict[tuple[Engine, str], OrganizationSearchBackend] = {}
+
+
+def get_search_backend(db: Session, mode: str = "auto") -> OrganizationSearchBackend:
+    """Pick the search backend; ``auto`` probes once per engine and falls back to ``LIKE``."""
+    if mode == "like":
+        return LikeSearchBackend()
+
+    engine = db.get_bind()
+    backend = _detected.get((engine, mode))
+    if backend is None:
+        probe = _PROBES.get(engine.dialect.name)
+        if probe is None:
+            if mode == "fulltext":
+                raise RuntimeError(f"Full-text organization search is not supported on {engine.dialect.name}")
+            backend = LikeSearchBackend()
+        else:
+            sql, backend_class = probe
+            if mode == "fulltext" or db.execute(text(sql)).first() is not None:
+                backend = backend_class()
+            else:
+                backend = LikeSearchBackend()
+        _detected[(engine, mode)] = backend
+    return backend
@@ -0,0 +1,376 @@
+"""The whole directory held in memory, for READ_SNAPSHOT_ENABLED."""
+
+from __future__ import annotations
+
+import gc
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Sequence
+from datetime import datetime
+from heapq import nsmallest
+from itertools import chain, islice
+from operator import attrgetter
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.geo import approximate_bounding_box, bounding_box_mask, haversine_km_many
+from app.dao.planner import OrganizationFilters
+from app.dao.records import ActivityRecord, BuildingRecord, OrganizationRecord
+from app.models import Activity, Building, Organization, OrganizationPhone, organization_activities
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+_EMPTY = array("I")
+_name_id = attrgetter("name", "id")
+
+
+class DirectorySnapshot:
+    """Immutable copy of the directory: organizations in ``(name, id)`` order, indexes as position arrays."""
+
+    __slots__ = (
+        "buildings",
+        "activities",
+        "activities_by_id",
+        "organizations",
+        "folded_names",
+        "by_building",
+        "by_activity",
+        "_ids_sorted",
+        "_positions_by_id",
+        "_building_ids",
+        "_latitudes",
+        "_longitudes",
+        "activity_dao",
+        "building_dao",
+        "organization_dao",
+    )
+
+    def __init__(
+        self,
+        buildings: Iterable[tuple[int, str, float, float, datetime]],
+        activities: Iterable[tuple[int, str, int | None, int]],
+        organizations: Iterable[tuple[int, str, int, datetime]],
+        phones: Iterable[tuple[int, str]],
+        links: Iterable[tuple[int, int]],
+    ):
+        shared: dict[Any, Any] = {}
+        share = shared.setdefault
+
+        self.buildings: dict[int, BuildingRecord] = {
+            building_id: BuildingRecord(building_id, address, latitude, longitude, share(created_at, created_at))
+            for building_id, address, latitude, longitude, created_at in buildings
+        }
+        self.activities = [ActivityRecord(*row) for row in activities]
+        self.activities_by_id = {activity.id: activity for activity in self.activities}
+
+        phone_numbers: dict[int, list[str]] = defaultdict(list)
+        for organization_id, phone_number in phones:
+            phone_numbers[organization_id].append(phone_number)
+        activity_ids: dict[int, list[int]] = defaultdict(list)
+        for organization_id, activity_id in links:
+            activity_ids[organization_id].append(activity_id)
+
+        self.organizations: list[OrganizationRecord] = []
+        for organization_id, name, building_id, created_at in sorted(organizations, key=lambda row: (row[1], row[0])):
+            linked = tuple(activity_ids.get(organization_id, ()))
+            self.organizations.append(
+                OrganizationRecord(
+                    organization_id,
+                    name,
+                    building_id,
+                    share(created_at, created_at),
+                    self.buildings[building_id],
+                    tuple(phone_numbers.get(organization_id, ())),
+                    share(linked, linked),
+                )
+            )
+        self.folded_names = [organization.name.casefold() for organization in self.organizations]
+
+        by_id = sorted(range(len(self.organizations)), key=lambda position: self.organizations[position].id)
+        self._ids_sorted = array("q", (self.organizations[position].id for position in by_id))
+        self._positions_by_id = array("I", by_id)
+
+        self.by_building: dict[int, array] = defaultdict(lambda: array("I"))
+        direct: dict[int, array] = defaultdict(lambda: array("I"))
+        for position, organization in enumerate(self.organizations):
+            self.by_building[organization.building_id].append(position)
+            for activity_id in organization.activity_ids:
+                direct[activity_id].append(position)
+        self.by_building = dict(self.by_building)
+
+        # Roll each activity's organizations up to its ancestors, counting each organization once per subtree.
+        subtree: dict[int, set[int]] = defaultdict(set)
+        for activity_id, positions in direct.items():
+            ancestor = self.activities_by_id.get(activity_id)
+            while ancestor is not None:
+                subtree[ancestor.id].update(positions)
+                ancestor = self.activities_by_id.get(ancestor.parent_id)
+        self.by_activity = {activity_id: array("I", sorted(positions)) for activity_id, positions in subtree.items()}
+
+        self._building_ids = array("q", self.buildings)
+        self._latitudes = array("d", (building.latitude for building in self.buildings.values()))
+        self._longitudes = array("d", (building.longitude for building in self.buildings.values()))
+
+        self.activity_dao = SnapshotActivityDAO(self)
+        self.building_dao = SnapshotBuildingDAO(self)
+        self.organization_dao = SnapshotOrganizationDAO(self)
+
+    @classmethod
+    def load(cls, db: Session) -> DirectorySnapshot:
+        """Read every table with one select each; related rows are joined up in Python."""
+        links = organization_activities.c
+        statements = (
+            select(Building.id, Building.address, Building.latitude, Building.longitude, Building.created_at).order_by(
+                Building.id
+            ),
+            select(Activity.id, Activity.name, Activity.parent_id, Activity.level).order_by(
+                Activity.level, Activity.name
+            ),
+            select(Organization.id, Organization.name, Organization.building_id, Organization.created_at),
+            select(OrganizationPhone.organization_id, OrganizationPhone.phone_number).order_by(OrganizationPhone.id),
+            select(links.organization_id, links.activity_id).order_by(links.activity_id),
+        )
+        # Hundreds of thousands of new objects and no garbage: collections would only rescan them.
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            return cls(*(db.execute(stmt) for stmt in statements))
+        finally:
+            if collecting:
+                gc.enable()
+
+    def position(self, organization_id: int) -> int | None:
+        index = bisect_left(self._ids_sorted, organization_id)
+        if index < len(self._ids_sorted) and self._ids_sorted[index] == organization_id:
+            return self._positions_by_id[index]
+        return None
+
+    def first_position_after(self, after: tuple[str, int] | None) -> int:
+        """Position of the first organization past the ``(name, id)`` keyset ``after``."""
+        if after is None:
+            return 0
+        return bisect_right(self.organizations, tuple(after), key=_name_id)
+
+    def buildings_within(
+        self,
+        box: tuple[float, float, float, float],
+        origin: tuple[float, float] | None = None,
+        max_distance_km: float | None = None,
+    ) -> list[tuple[int, float | None]]:
+        """``(building_id, distance_km)`` inside the box and radius; distances are ``None`` without ``origin``."""
+        if np is not None:
+            latitudes = np.frombuffer(self._latitudes, dtype=np.float64)
+            longitudes = np.frombuffer(self._longitudes, dtype=np.float64)
+            positions = np.flatnonzero(bounding_box_mask(latitudes, longitudes, *box)).tolist()
+        else:
+            mask = bounding_box_mask(self._latitudes, self._longitudes, *box)
+            positions = [position for position, inside in enumerate(mask) if inside]
+        ids = [self._building_ids[position] for position in positions]
+        if origin is None:
+            return [(building_id, None) for building_id in ids]
+
+        distances = haversine_km_many(
+            origin[0],
+            origin[1],
+            [self._latitudes[position] for position in positions],
+            [self._longitudes[position] for position in positions],
+        )
+        if np is not None:
+            distances = distances.tolist()
+        return [
+            (building_id, distance)
+            for building_id, distance in zip(ids, distances)
+            if max_distance_km is None or distance <= max_distance_km
+        ]
+
+
+class SnapshotActivityDAO:
+    """The ``ActivityDAO`` reads, answered from a snapshot."""
+
+    def __init__(self, snapshot: DirectorySnapshot):
+        self.snapshot = snapshot
+
+    def list_all(self) -> list[ActivityRecord]:
+        return list(self.snapshot.activities)
+
+    def get(self, activity_id: int) -> ActivityRecord | None:
+        return self.snapshot.activities_by_id.get(activity_id)
+
+    def organization_counts(self) -> dict[int, int]:
+        by_activity = self.snapshot.by_activity
+        return {
+            activity_id: len(by_activity.get(activity_id, _EMPTY))
+            for activity_id in sorted(self.snapshot.activities_by_id)
+        }
+
+
+class SnapshotBuildingDAO:
+    """The ``BuildingDAO`` reads, answered from a snapshot."""
+
+    def __init__(self, snapshot: DirectorySnapshot):
+        self.snapshot = snapshot
+
+    def list_all(self) -> list[BuildingRecord]:
+        return list(self.snapshot.buildings.values())
+
+    def get(self, building_id: int) -> BuildingRecord | None:
+        return self.snapshot.buildings.get(building_id)
+
+    def list_coordinates(self) -> list[tuple[int, float, float]]:
+        return [(building.id, building.latitude, building.longitude) for building in self.snapshot.buildings.values()]
+
+    def organization_counts(self) -> dict[int, int]:
+        by_building = self.snapshot.by_building
+        return {building_id: len(by_building.get(building_id, _EMPTY)) for building_id in self.snapshot.buildings}
+
+
+class SnapshotOrganizationDAO:
+    """The ``OrganizationDAO(readonly=True)`` reads, answered from a snapshot."""
+
+    readonly = True
+
+    def __init__(self, snapshot: DirectorySnapshot):
+        self.snapshot = snapshot
+
+    def get(self, organization_id: int) -> OrganizationRecord | None:
+        position = self.snapshot.position(organization_id)
+        return self.snapshot.organizations[position] if position is not None else None
+
+    def get_many(self, organization_ids: list[int]) -> dict[int, OrganizationRecord]:
+        found = {}
+        for organization_id in organization_ids:
+            organization = self.get(organization_id)
+            if organization is not None:
+                found[organization_id] = organization
+        return found
+
+    def list_by_ids(self, organization_ids: list[int]) -> list[OrganizationRecord]:
+        by_id = self.get_many(organization_ids)
+        return [by_id[organization_id] for organization_id in organization_ids if organization_id in by_id]
+
+    def list_names(self, organization_ids: list[int] | None = None) -> list[tuple[int, str]]:
+        organizations = self.snapshot.organizations if organization_ids is None else self.list_by_ids(organization_ids)
+        return [(organization.id, organization.name) for organization in organizations]
+
+    def _page(
+        self,
+        positions: Sequence[int],
+        limit: int,
+        after: tuple[str, int] | None = None,
+        checks: Sequence[Callable[[int], bool]] = (),
+    ) -> list[OrganizationRecord]:
+        """At most ``limit`` organizations from sorted ``positions`` past ``after`` that pass every check."""
+        start = bisect_left(positions, self.snapshot.first_position_after(after))
+        matching = islice(positions, start, None)
+        for check in checks:
+            matching = filter(check, matching)
+        return list(map(self.snapshot.organizations.__getitem__, islice(matching, limit)))
+
+    def _name_check(self, query: str) -> Callable[[int], bool]:
+        folded_query = query.strip().casefold()
+        folded_names = self.snapshot.folded_names
+        return lambda position: folded_query in folded_names[position]
+
+    def search_by_name(self, query: str, limit: int) -> list[OrganizationRecord]:
+        return self._page(range(len(self.snapshot.organizations)), limit, checks=[self._name_check(query)])
+
+    def list_by_building(
+        self, building_id: int, *, limit: int, after: tuple[str, int] | None = None
+    ) -> list[OrganizationRecord]:
+        return self._page(self.snapshot.by_building.get(building_id, _EMPTY), limit, after)
+
+    def list_by_building_ids(self, building_ids: list[int], *, limit: int) -> list[OrganizationRecord]:
+        by_building = self.snapshot.by_building
+        positions = (position for building_id in building_ids for position in by_building.get(building_id, _EMPTY))
+        return list(map(self.snapshot.organizations.__getitem__, islice(positions, limit)))
+
+    def list_by_activity_subtree(
+        self, activity_id: int, *, limit: int, after: tuple[str, int] | None = None
+    ) -> list[OrganizationRecord]:
+        return self._page(self.snapshot.by_activity.get(activity_id, _EMPTY), limit, after)
+
+    def list_filtered(
+        self, filters: OrganizationFilters, *, limit: int, after: tuple[str, int] | None = None
+    ) -> list[OrganizationRecord]:
+        """One ``(name, id)`` page of organizations matching every filter, driven by the most selective one."""
+        snapshot = self.snapshot
+        organizations = snapshot.organizations
+        # (candidate count, sorted candidate positions, membership test)
+        candidates: list[tuple[int, Callable[[], Sequence[int]], Callable[[int], bool]]] = []
+        if filters.building_id is not None:
+            building_id = filters.building_id
+            in_building = snapshot.by_building.get(building_id, _EMPTY)
+            candidates.append(
+                (
+                    len(in_building),
+                    lambda: in_building,
+                    lambda position: organizations[position].building_id == building_id,
+                )
+            )
+        if filters.activity_id is not None:
+            in_subtree = snapshot.by_activity.get(filters.activity_id, _EMPTY)
+            candidates.append((len(in_subtree), lambda: in_subtree, lambda position: _contains(in_subtree, position)))
+
+        areas = []
+        if filters.bounds is not None:
+            areas.append(snapshot.buildings_within(filters.bounds))
+        if filters.radius is not None:
+            latitude, longitude, radius_km = filters.radius
+            box = approximate_bounding_box(latitude, longitude, radius_km)
+            areas.append(snapshot.buildings_within(box, (latitude, longitude), radius_km))
+        for matches in areas:
+            building_ids = {building_id for building_id, _ in matches}
+            postings = [snapshot.by_building.get(building_id, _EMPTY) for building_id in building_ids]
+            candidates.append(
+                (
+                    sum(map(len, postings)),
+                    lambda postings=postings: sorted(chain.from_iterable(postings)),
+                    lambda position, building_ids=building_ids: organizations[position].building_id in building_ids,
+                )
+            )
+
+        checks = [self._name_check(filters.query)] if filters.query is not None else []
+        if not candidates:
+            return self._page(range(len(organizations)), limit, after, checks)
+        candidates.sort(key=lambda candidate: candidate[0])
+        checks.extend(check for _, _, check in candidates[1:])
+        return self._page(candidates[0][1](), limit, after, checks)
+
+    def list_nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        *,
+        min_latitude: float,
+        max_latitude: float,
+        min_longitude: float,
+        max_longitude: float,
+        radius_km: float | None,
+        limit: int,
+    ) -> list[tuple[OrganizationRecord, float]]:
+        """Organizations inside the box (and radius), nearest first, with their distance in km."""
+        snapshot = self.snapshot
+        organizations = snapshot.organizations
+        matches = snapshot.buildings_within(
+            (min_latitude, max_latitude, min_longitude, max_longitude), (latitude, longitude), radius_km
+        )
+        nearest = nsmallest(
+            limit,
+            (
+                (distance, organizations[position].name, position)
+                for building_id, distance in matches
+                for position in snapshot.by_building.get(building_id, _EMPTY)
+            ),
+        )
+        return [(organizations[position], distance) for distance, _, position in nearest]
+
+
+def _contains(positions: array, position: int) -> bool:
+    index = bisect_left(positions, position)
+    return index < len(positions) and positions[index] == position
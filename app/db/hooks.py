@@ -0,0 +1,17 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.dao.activity import rebuild_activity_closure
+from app.db.versioning import changed_tables
+from app.models import Activity
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_activity_closure(session: Session, flush_context) -> None:
+    # The hierarchy is tiny, so any activity write recomputes the closure in the same transaction.
+    hierarchy_changed = any(isinstance(instance, Activity) for instance in (*session.new, *session.deleted)) or any(
+        isinstance(instance, Activity) and Activity.__tablename__ in changed_tables(instance)
+        for instance in session.dirty
+    )
+    if hierarchy_changed:
+        rebuild_activity_closure(session.connection())
@@ -1,12 +1,144 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from functools import lru_cache
+from typing import Any
 
-from app.core.config import get_settings
+from sqlalchemy import AsyncAdaptedQueuePool, create_engine, event
+from sqlalchemy.engine import Engine, URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import Settings, get_settings
+from app.core.geo import haversine_km
+from app.core.metrics import instrument_engine
+from app.db import hooks, versioning  # noqa: F401  registers write hooks
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {},
-)
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
+# Async counterparts of the sync drivers, used when ASYNC_MODE is enabled.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_database_url(database_url: str) -> str:
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if url.get_driver_name() in {"aiosqlite", "asyncpg"}:
+        return database_url
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend!r} databases")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def _is_memory_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(database_url: str, settings: Settings) -> dict[str, Any]:
+    """``create_engine`` keyword arguments for ``database_url`` from the pool/driver settings."""
+    url = make_url(database_url)
+    backend, driver = url.get_backend_name(), url.get_driver_name()
+    connect_args: dict[str, Any] = {}
+    options: dict[str, Any] = {"connect_args": connect_args, "pool_pre_ping": settings.db_pool_pre_ping}
+
+    if not _is_memory_sqlite(url):
+        # In-memory SQLite uses a singleton-connection pool without size settings.
+        if driver == "aiosqlite":
+            # SQLAlchemy defaults aiosqlite to NullPool; pool file databases like the sync engine.
+            options["poolclass"] = AsyncAdaptedQueuePool
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+
+    if backend == "sqlite":
+        connect_args["check_same_thread"] = False
+    elif backend == "postgresql":
+        timeout = settings.db_statement_timeout_ms
+        if driver == "asyncpg":
+            connect_args["prepared_statement_cache_size"] = settings.db_prepared_statement_cache_size
+            if timeout:
+                connect_args["server_settings"] = {"statement_timeout": str(timeout)}
+        elif timeout:
+            connect_args["options"] = f"-c statement_timeout={timeout}"
+    return options
+
+
+def _configure_sqlite(engine: Engine, settings: Settings) -> None:
+    if engine.dialect.name != "sqlite":
+        return
+
+    pragmas = {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "mmap_size": settings.sqlite_mmap_size,
+        "cache_size": settings.sqlite_cache_size,
+    }
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        # SQLite has no trigonometry by default; nearby search calls this haversine in SQL.
+        dbapi_connection.create_function("haversine_km", 4, haversine_km, deterministic=True)
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                if value is not None:
+                    cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def _configure_engine(engine: Engine, settings: Settings) -> None:
+    _configure_sqlite(engine, settings)
+    if settings.profiling_enabled:
+        instrument_engine(engine)
+
+
+@lru_cache
+def get_engine() -> Engine:
+    """The sync engine, created on first use rather than on import."""
+    engine = create_engine(settings.database_url, **engine_options(settings.database_url, settings))
+    _configure_engine(engine, settings)
+    return engine
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine | None:
+    """The async engine when ASYNC_MODE is enabled, otherwise ``None``; created on first use."""
+    if not settings.async_mode:
+        return None
+    url = async_database_url(settings.database_url)
+    engine = create_async_engine(url, **engine_options(url, settings))
+    _configure_engine(engine.sync_engine, settings)
+    return engine
+
+
+@lru_cache
+def get_sessionmaker() -> sessionmaker[Session]:
+    return sessionmaker(bind=get_engine(), autocommit=False, autoflush=False, expire_on_commit=False)
+
+
+@lru_cache
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession] | None:
+    engine = get_async_engine()
+    if engine is None:
+        return None
+    return async_sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
+
+
+def created_engines() -> tuple[Engine | None, AsyncEngine | None]:
+    """The sync and async engines if they have been created already; never creates one."""
+    sync_engine = get_engine() if get_engine.cache_info().currsize else None
+    async_engine = get_async_engine() if get_async_engine.cache_info().currsize else None
+    return sync_engine, async_engine
+
+
+def pool_stats(engine: Engine) -> dict[str, Any]:
+    pool = engine.pool
+    stats: dict[str, Any] = {"pool_class": type(pool).__name__, "status": pool.status()}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        stats[name] = method() if callable(method) else None
+    return stats
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import threading
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterable
+
+from sqlalchemy import Connection, event, insert, inspect, select, update
+from sqlalchemy.orm import Session
+
+from app.models import stored_data_versions
+
+# Tables are grouped into coarse scopes: a change to a phone number invalidates
+# everything derived from organizations, not a separate "phones" cache.
+TABLE_SCOPES: dict[str, str] = {
+    "activities": "activities",
+    "buildings": "buildings",
+    "organizations": "organizations",
+    "organization_phones": "organizations",
+    "organization_activities": "organizations",
+}
+
+# Attribute holding the id of the scope's root entity, per mapped table.
+_SCOPE_KEYS: dict[str, str] = {
+    "activities": "id",
+    "buildings": "id",
+    "organizations": "id",
+    "organization_phones": "organization_id",
+}
+
+_CHANGED_SCOPES_KEY = "changed_scopes"
+_CHANGED_KEYS_KEY = "changed_keys"
+
+
+class DataVersions:
+    """Process-level counters used to invalidate in-memory read structures.
+
+    Sessions bump the scopes they wrote after commit; writes from other processes
+    arrive through the persisted copy (``bump_stored_versions``). Structures cached
+    per version rebuild on the next read, while requests holding the old one keep it.
+    A bump may carry the changed root ids, so incremental consumers can catch up.
+    """
+
+    def __init__(self, log_size: int = 1024) -> None:
+        self._versions: dict[str, int] = defaultdict(int)
+        self._changes: dict[str, deque[tuple[int, frozenset[int] | None]]] = defaultdict(
+            lambda: deque(maxlen=log_size)
+        )
+        self._listeners: list[Callable[[str, frozenset[int] | None], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: Callable[[str, frozenset[int] | None], None]) -> None:
+        """Call ``listener(scope, changed ids or None)`` after every bump, e.g. to evict cache entries."""
+        self._listeners.append(listener)
+
+    def current(self, scope: str) -> int:
+        return self._versions[scope]
+
+    def bump(self, *scopes: str, keys: dict[str, set[int] | None] | None = None) -> None:
+        """Advance ``scopes``; ``keys`` maps a scope to its changed ids (unknown when missing)."""
+        changes = []
+        with self._lock:
+            for scope in scopes:
+                self._versions[scope] += 1
+                scope_keys = keys.get(scope) if keys else None
+                change = frozenset(scope_keys) if scope_keys is not None else None
+                self._changes[scope].append((self._versions[scope], change))
+                changes.append((scope, change))
+        for scope, change in changes:
+            for listener in self._listeners:
+                listener(scope, change)
+
+    def changes_since(self, scope: str, version: int) -> set[int] | None:
+        """Ids changed in ``scope`` after ``version``, or ``None`` if they are not all known."""
+        with self._lock:
+            current = self._versions[scope]
+            if version == current:
+                return set()
+            log = [entry for entry in self._changes[scope] if entry[0] > version]
+        if len(log) != current - version or any(keys is None for _, keys in log):
+            return None
+        return set().union(*(keys for _, keys in log))
+
+
+data_versions = DataVersions()
+
+
+def bump_stored_versions(connection: Connection, scopes: Iterable[str]) -> None:
+    """Advance the persisted versions of ``scopes`` in the current transaction."""
+    scopes = sorted(set(scopes))
+    table = stored_data_versions
+    result = connection.execute(
+        update(table).where(table.c.scope.in_(scopes)).values(version=table.c.version + 1)
+    )
+    if result.rowcount < len(scopes):
+        # The migration seeds every scope; databases made by create_all start empty.
+        existing = set(connection.scalars(select(table.c.scope).where(table.c.scope.in_(scopes))))
+        connection.execute(insert(table), [{"scope": scope, "version": 1} for scope in scopes if scope not in existing])
+
+
+def read_stored_versions(connection: Connection) -> dict[str, int]:
+    table = stored_data_versions
+    return {scope: version for scope, version in connection.execute(select(table.c.scope, table.c.version))}
+
+
+def changed_tables(instance: object) -> set[str]:
+    """Tables actually written by flushing a dirty ``instance``."""
+    state = inspect(instance)
+    tables = set()
+    for attribute in state.mapper.column_attrs:
+        if state.attrs[attribute.key].history.has_changes():
+            tables.add(state.mapper.local_table.name)
+            break
+    for relationship in state.mapper.relationships:
+        if relationship.secondary is not None and state.attrs[relationship.key].history.has_changes():
+            tables.add(relationship.secondary.name)
+    return tables
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_scopes(session: Session, flush_context) -> None:
+    changed: set[str] = session.info.setdefault(_CHANGED_SCOPES_KEY, set())
+    changed_keys: dict[str, set[int] | None] = session.info.setdefault(_CHANGED_KEYS_KEY, defaultdict(set))
+
+    touched: list[tuple[object, set[str]]] = []
+    for instance in (*session.new, *session.deleted):
+        table = getattr(type(instance), "__table__", None)
+        if table is not None:
+            touched.append((instance, {table.name}))
+    for instance in session.dirty:
+        touched.append((instance, changed_tables(instance)))
+
+    flushed: set[str] = set()
+    for instance, tables in touched:
+        own_table = type(instance).__table__.name
+        for table in tables:
+            scope = TABLE_SCOPES.get(table)
+            if scope is None:
+                continue
+            changed.add(scope)
+            flushed.add(scope)
+            key = None
+            if TABLE_SCOPES.get(own_table) == scope and own_table in _SCOPE_KEYS:
+                key = getattr(instance, _SCOPE_KEYS[own_table])
+            if key is None:
+                # Written from the other side (e.g. an association row): ids unknown, consumers reload.
+                changed_keys[scope] = None
+            elif changed_keys[scope] is not None:
+                changed_keys[scope].add(key)
+    if flushed:
+        bump_stored_versions(session.connection(), flushed)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_changed_scopes(session: Session) -> None:
+    changed = session.info.pop(_CHANGED_SCOPES_KEY, None)
+    changed_keys = session.info.pop(_CHANGED_KEYS_KEY, None)
+    if changed:
+        data_versions.bump(*changed, keys=changed_keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_scopes(session: Session) -> None:
+    session.info.pop(_CHANGED_SCOPES_KEY, None)
+    session.info.pop(_CHANGED_KEYS_KEY, None)
@@ -1,19 +1,103 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
+from app.api.auth import ApiKeyMiddleware, add_api_key_security, build_rate_limiter, configured_api_keys
+from app.api.profiling import ProfilingMiddleware
 from app.api.router import api_router
 from app.core.config import get_settings
+from app.db import session as db_session
+from app.services.warmup import warm_up, warmed_up
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+WARM_UP_RETRY_SECONDS = 5.0
+
+
+def _warm_up() -> None:
+    with db_session.get_sessionmaker()() as db:
+        warm_up(db, settings)
+
+
+async def _warm_up_until_ready() -> None:
+    # Runs beside the server: /ready answers once it is done, earlier requests build on demand.
+    while True:
+        try:
+            async_sessions = db_session.get_async_sessionmaker()
+            if async_sessions is not None:
+                async with async_sessions() as db:
+                    await db.run_sync(warm_up, settings)
+            else:
+                await run_in_threadpool(_warm_up)
+        except Exception:
+            logger.exception("Warm-up failed, retrying in %.0f s", WARM_UP_RETRY_SECONDS)
+            await asyncio.sleep(WARM_UP_RETRY_SECONDS)
+        else:
+            warmed_up.set()
+            return
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Engines are created here rather than on import; ASYNC_MODE never needs the sync one.
+    async_engine = db_session.get_async_engine()
+    if async_engine is None:
+        db_session.get_engine()
+    warming = asyncio.create_task(_warm_up_until_ready())
+    yield
+    warming.cancel()
+    with suppress(asyncio.CancelledError):
+        await warming
+    if async_engine is not None:
+        await async_engine.dispose()
+
 
 app = FastAPI(
     title=settings.project_name,
     version="1.0.0",
     description="REST API справочника организаций, зданий и видов деятельности.",
+    lifespan=lifespan,
 )
 
 app.include_router(api_router, prefix=settings.api_prefix)
 
+if settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+
+# Added last so it runs first: rejected requests skip profiling and routing.
+app.add_middleware(
+    ApiKeyMiddleware,
+    keys=configured_api_keys(settings),
+    limiter=build_rate_limiter(settings),
+    prefix=settings.api_prefix,
+)
+_generate_openapi = app.openapi
+
+
+def _openapi() -> dict:
+    # Authentication happens in the middleware, so the routes no longer declare the scheme themselves.
+    if app.openapi_schema is None:
+        add_api_key_security(_generate_openapi(), settings.api_prefix)
+    return app.openapi_schema
+
+
+app.openapi = _openapi
+
 
 @app.get("/health", tags=["health"])
 def health_check() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/ready", tags=["health"], responses={503: {"description": "Read structures are still being built"}})
+def readiness_check() -> JSONResponse:
+    """Readiness probe: 503 until this process has finished its warm-up."""
+    if not warmed_up.is_set():
+        return JSONResponse({"status": "warming up"}, status_code=503)
+    return JSONResponse({"status": "ready"})
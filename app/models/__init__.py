@@ -1,11 +1,14 @@
-from app.models.activity import Activity
+from app.models.activity import Activity, ActivityClosure
 from app.models.building import Building
+from app.models.data_version import stored_data_versions
 from app.models.organization import Organization, OrganizationPhone, organization_activities
 
 __all__ = [
     "Activity",
+    "ActivityClosure",
     "Building",
     "Organization",
     "OrganizationPhone",
     "organization_activities",
+    "stored_data_versions",
 ]
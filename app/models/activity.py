@@ -24,3 +24,15 @@ class Activity(Base):
     organizations: Mapped[list["Organization"]] = relationship(
         "Organization", secondary="organization_activities", back_populates="activities"
     )
+
+
+class ActivityClosure(Base):
+    """Every (ancestor, descendant) pair of the activity tree, including self-pairs at depth 0."""
+
+    __tablename__ = "activity_closure"
+
+    ancestor_id: Mapped[int] = mapped_column(ForeignKey("activities.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id: Mapped[int] = mapped_column(
+        ForeignKey("activities.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
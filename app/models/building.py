@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, String, func
+from sqlalchemy import DateTime, Float, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -10,6 +10,7 @@ from app.db.base import Base
 
 class Building(Base):
     __tablename__ = "buildings"
+    __table_args__ = (Index("ix_buildings_latitude_longitude", "latitude", "longitude"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     address: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
@@ -0,0 +1,11 @@
+from sqlalchemy import BigInteger, Column, String, Table
+
+from app.db.base import Base
+
+# Persisted counterpart of ``app.db.versioning.data_versions``.
+stored_data_versions = Table(
+    "data_versions",
+    Base.metadata,
+    Column("scope", String(32), primary_key=True),
+    Column("version", BigInteger, nullable=False, server_default="0"),
+)
@@ -11,7 +11,7 @@ organization_activities = Table(
     "organization_activities",
     Base.metadata,
     Column("organization_id", ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True),
-    Column("activity_id", ForeignKey("activities.id", ondelete="CASCADE"), primary_key=True),
+    Column("activity_id", ForeignKey("activities.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 
@@ -20,7 +20,9 @@ class Organization(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(150), nullable=False, unique=True, index=True)
-    building_id: Mapped[int] = mapped_column(ForeignKey("buildings.id", ondelete="RESTRICT"), nullable=False)
+    building_id: Mapped[int] = mapped_column(
+        ForeignKey("buildings.id", ondelete="RESTRICT"), nullable=False, index=True
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     building: Mapped["Building"] = relationship("Building", back_populates="organizations")
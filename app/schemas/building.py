@@ -17,6 +17,21 @@ class BuildingRead(BuildingBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class BuildingClusterRead(BaseModel):
+    latitude: float
+    longitude: float
+    count: int
+    building_id: int | None = None
+
+
+class BuildingTileRead(BaseModel):
+    zoom: int
+    x: int
+    y: int
+    count: int
+    clusters: list[BuildingClusterRead]
+
+
 class BuildingWithOrganizations(BuildingRead):
     organizations: list["OrganizationRead"] | None = None
 
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.schemas.activity import ActivityRead
 from app.schemas.building import BuildingRead
@@ -21,3 +21,28 @@ class OrganizationRead(BaseModel):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class OrganizationNearbyRead(OrganizationRead):
+    distance_km: float | None = None
+
+
+class OrganizationPage(BaseModel):
+    items: list[OrganizationRead]
+    next_cursor: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OrganizationCountRead(BaseModel):
+    id: int
+    organization_count: int
+
+
+class OrganizationBatchRequest(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=500)
+
+
+class OrganizationBatchRead(BaseModel):
+    items: list[OrganizationRead]
+    missing: list[int]
@@ -0,0 +1,78 @@
+"""Plain-dict serializers producing the same JSON as the organization response models."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from operator import attrgetter
+from typing import Any
+
+from app.schemas.activity import ActivityRead
+
+
+def activity_payloads(roots: Iterable[ActivityRead]) -> dict[int, dict[str, Any]]:
+    """Map activity id to its ``ActivityRead`` dump as embedded in an organization."""
+    payloads: dict[int, dict[str, Any]] = {}
+
+    def visit(node: ActivityRead) -> dict[str, Any]:
+        payload = payloads[node.id] = {
+            "name": node.name,
+            "parent_id": node.parent_id,
+            "id": node.id,
+            "level": node.level,
+            "children": [visit(child) for child in sorted(node.children or (), key=attrgetter("id"))],
+        }
+        return payload
+
+    for root in roots:
+        visit(root)
+    return payloads
+
+
+class OrganizationSerializer:
+    """Turns ``OrganizationRecord`` rows into JSON-ready dicts."""
+
+    __slots__ = ("_activities", "_buildings")
+
+    def __init__(self, activities: Mapping[int, dict[str, Any]]):
+        self._activities = activities
+        self._buildings: dict[int, dict[str, Any]] = {}
+
+    def building(self, building) -> dict[str, Any]:
+        payload = self._buildings.get(building.id)
+        if payload is None:
+            payload = self._buildings[building.id] = {
+                "address": building.address,
+                "latitude": building.latitude,
+                "longitude": building.longitude,
+                "id": building.id,
+                "created_at": building.created_at,
+            }
+        return payload
+
+    def organization(self, organization) -> dict[str, Any]:
+        activities = self._activities
+        return {
+            "id": organization.id,
+            "name": organization.name,
+            "building": self.building(organization.building),
+            "activities": [activities[activity_id] for activity_id in organization.activity_ids],
+            "phones": [{"phone_number": phone_number} for phone_number in organization.phone_numbers],
+            "created_at": organization.created_at,
+        }
+
+    def organizations(self, organizations: Iterable) -> list[dict[str, Any]]:
+        return [self.organization(organization) for organization in organizations]
+
+    def nearby(self, matches: Iterable[tuple[Any, float]]) -> list[dict[str, Any]]:
+        results = []
+        for organization, distance_km in matches:
+            payload = self.organization(organization)
+            payload["distance_km"] = distance_km
+            results.append(payload)
+        return results
+
+    def page(self, page) -> dict[str, Any]:
+        return {"items": self.organizations(page.items), "next_cursor": page.next_cursor}
+
+    def batch(self, organizations: Iterable, missing: list[int]) -> dict[str, Any]:
+        return {"items": self.organizations(organizations), "missing": missing}
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+
+
+class PoolStatsRead(BaseModel):
+    pool_class: str
+    status: str
+    size: int | None = None
+    checkedin: int | None = None
+    checkedout: int | None = None
+    overflow: int | None = None
+
+
+class EnginePoolsRead(BaseModel):
+    sync_engine: PoolStatsRead | None = None
+    async_engine: PoolStatsRead | None = None
+
+
+class EntityCacheStatsRead(BaseModel):
+    backend: str
+    entries: int | None = None
+    hits: int
+    misses: int
+    coalesced: int
+    invalidations: int
+    errors: int
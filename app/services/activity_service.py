@@ -1,11 +1,64 @@
 from __future__ import annotations
 
-from collections import defaultdict, deque
+import hashlib
+from collections import defaultdict
+
+from pydantic import TypeAdapter
 
 from app.dao import ActivityDAO, OrganizationDAO
 from app.models import Activity
 from app.schemas.activity import ActivityRead
+from app.schemas.serializers import activity_payloads
+from app.services.cache import VersionedCache
+from app.services.counts import OrganizationCounts
 from app.services.exceptions import NotFoundError
+from app.services.pagination import Page, paginate
+
+
+_activity_list_adapter = TypeAdapter(list[ActivityRead])
+
+
+class ActivityTree:
+    """Immutable snapshot of the activity hierarchy shared by all requests."""
+
+    __slots__ = ("roots", "by_id", "by_name", "payloads", "json", "digest")
+
+    def __init__(self, activities: list[Activity]):
+        adjacency = ActivityService._build_adjacency(activities)
+        self.roots: list[ActivityRead] = [
+            ActivityService._serialize_activity_tree(node, adjacency) for node in adjacency[None]
+        ]
+        self.by_id: dict[int, ActivityRead] = {}
+        stack = list(self.roots)
+        while stack:
+            node = stack.pop()
+            self.by_id[node.id] = node
+            stack.extend(node.children or ())
+        self.by_name: dict[str, int] = {node.name.casefold(): node.id for node in self.by_id.values()}
+        # Per-activity dicts embedded by the organization fast-path serializer.
+        self.payloads = activity_payloads(self.roots)
+        self.json: bytes = _activity_list_adapter.dump_json(self.roots)
+        self.digest = hashlib.sha256(self.json).hexdigest()[:32]
+
+
+_activity_tree_cache: VersionedCache[ActivityTree] = VersionedCache("activities")
+
+
+def cached_activity_tree() -> ActivityTree | None:
+    """The current activity tree if it is already cached, without touching the database."""
+    return _activity_tree_cache.peek()
+
+
+def load_activity_tree(activity_dao: ActivityDAO) -> ActivityTree:
+    return _activity_tree_cache.get(lambda: ActivityTree(activity_dao.list_all()))
+
+
+# Rolled-up counts depend on both the hierarchy and organization links.
+_activity_counts_cache: VersionedCache[OrganizationCounts] = VersionedCache("activities", "organizations")
+
+
+def cached_activity_counts() -> OrganizationCounts | None:
+    return _activity_counts_cache.peek()
 
 
 class ActivityService:
@@ -13,23 +66,28 @@ class ActivityService:
         self.activity_dao = activity_dao
         self.organization_dao = organization_dao
 
-    def get_activity_tree(self) -> list[ActivityRead]:
-        activities = self.activity_dao.list_all()
-        adjacency = self._build_adjacency(activities)
-        return [self._serialize_activity_tree(node, adjacency) for node in adjacency[None]]
+    def activity_tree(self) -> ActivityTree:
+        return load_activity_tree(self.activity_dao)
+
+    def organization_counts(self) -> OrganizationCounts:
+        return _activity_counts_cache.get(lambda: OrganizationCounts(self.activity_dao.organization_counts()))
 
-    def organizations_for_activity(self, activity_id: int):
-        activities = self.activity_dao.list_all()
-        descendant_ids = self._descendant_ids(activities, activity_id)
-        if not descendant_ids:
+    def organizations_for_activity(self, activity_id: int, limit: int, cursor: str | None = None) -> Page:
+        if activity_id not in self.activity_tree().by_id:
             raise NotFoundError("Activity not found")
-        return self.organization_dao.list_by_activity_ids(descendant_ids)
+        return paginate(
+            lambda page_size, after: self.organization_dao.list_by_activity_subtree(
+                activity_id, limit=page_size, after=after
+            ),
+            limit,
+            cursor,
+        )
 
-    def organizations_for_activity_name(self, name: str):
-        activity = self.activity_dao.find_by_name(name)
-        if not activity:
+    def organizations_for_activity_name(self, name: str, limit: int, cursor: str | None = None) -> Page:
+        activity_id = self.activity_tree().by_name.get(name.strip().casefold())
+        if activity_id is None:
             raise NotFoundError("Activity not found")
-        return self.organizations_for_activity(activity.id)
+        return self.organizations_for_activity(activity_id, limit, cursor)
 
     @staticmethod
     def _build_adjacency(activities: list[Activity]) -> dict[int | None, list[Activity]]:
@@ -38,24 +96,11 @@ class ActivityService:
             adjacency[activity.parent_id].append(activity)
         return adjacency
 
-    def _descendant_ids(self, activities: list[Activity], root_activity_id: int) -> list[int]:
-        if root_activity_id not in {activity.id for activity in activities}:
-            return []
-
-        adjacency = self._build_adjacency(activities)
-        descendants: list[int] = []
-        queue: deque[int] = deque([root_activity_id])
-
-        while queue:
-            current_id = queue.popleft()
-            descendants.append(current_id)
-            for child in adjacency[current_id]:
-                queue.append(child.id)
-
-        return descendants
-
-    def _serialize_activity_tree(self, activity: Activity, adjacency: dict[int | None, list[Activity]]) -> ActivityRead:
-        children = [self._serialize_activity_tree(child, adjacency) for child in adjacency.get(activity.id, [])]
+    @staticmethod
+    def _serialize_activity_tree(activity: Activity, adjacency: dict[int | None, list[Activity]]) -> ActivityRead:
+        children = [
+            ActivityService._serialize_activity_tree(child, adjacency) for child in adjacency.get(activity.id, [])
+        ]
         return ActivityRead.model_validate(
             {
                 "id": activity.id,
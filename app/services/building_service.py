@@ -1,5 +1,17 @@
+from app.core.config import get_settings
 from app.dao import BuildingDAO, OrganizationDAO
-from app.services.exceptions import NotFoundError
+from app.services.cache import VersionedCache
+from app.services.counts import OrganizationCounts
+from app.services.exceptions import NotFoundError, ValidationError
+from app.services.pagination import Page, paginate
+from app.services.spatial_index import get_building_index
+from app.services.tiles import BuildingTile, cluster_tile, tile_store
+
+_building_counts_cache: VersionedCache[OrganizationCounts] = VersionedCache("buildings", "organizations")
+
+
+def cached_building_counts() -> OrganizationCounts | None:
+    return _building_counts_cache.peek()
 
 
 class BuildingService:
@@ -10,8 +22,27 @@ class BuildingService:
     def list_buildings(self):
         return self.building_dao.list_all()
 
-    def organizations_in_building(self, building_id: int):
+    def organization_counts(self) -> OrganizationCounts:
+        return _building_counts_cache.get(lambda: OrganizationCounts(self.building_dao.organization_counts()))
+
+    def building_tile(self, zoom: int, x: int, y: int) -> BuildingTile:
+        if not (0 <= x < 2**zoom and 0 <= y < 2**zoom):
+            raise ValidationError(f"Tile {x}/{y} is outside zoom level {zoom}")
+        settings = get_settings()
+        store = tile_store(settings.tile_cache_max_entries)
+        tile = store.get((zoom, x, y))
+        if tile is None:
+            index = get_building_index(self.building_dao, settings.spatial_index_cell_degrees)
+            tile = BuildingTile(zoom, x, y, cluster_tile(index, zoom, x, y, settings.tile_cluster_grid))
+            store.put((zoom, x, y), tile)
+        return tile
+
+    def organizations_in_building(self, building_id: int, limit: int, cursor: str | None = None) -> Page:
         building = self.building_dao.get(building_id)
         if not building:
             raise NotFoundError("Building not found")
-        return self.organization_dao.list_by_building(building_id)
+        return paginate(
+            lambda page_size, after: self.organization_dao.list_by_building(building_id, limit=page_size, after=after),
+            limit,
+            cursor,
+        )
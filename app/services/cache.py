@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+from app.db.versioning import data_versions
+
+T = TypeVar("T")
+
+
+class LoaderLock:
+    """Lock around a process-wide load; greenlet callers poll on the event loop instead of blocking it."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> None:
+        if not in_greenlet():
+            self._lock.acquire()
+            return
+        delay = 0.0005
+        while not self._lock.acquire(blocking=False):
+            await_only(asyncio.sleep(delay))
+            delay = min(delay * 2, 0.01)
+
+    def __exit__(self, *exc_info) -> None:
+        self._lock.release()
+
+
+class VersionedCache(Generic[T]):
+    """Process-level cache of one value, recomputed when any of its data scopes changes."""
+
+    def __init__(self, *scopes: str):
+        self.scopes = scopes
+        self._entry: tuple[tuple[int, ...], T] | None = None
+        self._lock = LoaderLock()
+
+    def version(self) -> tuple[int, ...]:
+        return tuple(data_versions.current(scope) for scope in self.scopes)
+
+    def peek(self) -> T | None:
+        """Return the cached value if it is still current, without loading."""
+        entry = self._entry
+        if entry is not None and entry[0] == self.version():
+            return entry[1]
+        return None
+
+    def get(self, loader: Callable[[], T]) -> T:
+        version = self.version()
+        entry = self._entry
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entry
+            if entry is None or entry[0] != version:
+                entry = self._entry = (version, loader())
+            return entry[1]
+
+    def clear(self) -> None:
+        self._entry = None
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import hashlib
+
+from pydantic import TypeAdapter
+
+from app.schemas.organization import OrganizationCountRead
+
+_count_list_adapter = TypeAdapter(list[OrganizationCountRead])
+
+
+class OrganizationCounts:
+    """Immutable organization counts per node, pre-serialized for conditional responses."""
+
+    __slots__ = ("by_id", "json", "digest")
+
+    def __init__(self, counts: dict[int, int]):
+        self.by_id = counts
+        self.json: bytes = _count_list_adapter.dump_json(
+            [OrganizationCountRead(id=node_id, organization_count=count) for node_id, count in counts.items()]
+        )
+        self.digest = hashlib.sha256(self.json).hexdigest()[:32]
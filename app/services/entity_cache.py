@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Generic, Protocol, TypeVar
+
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+
+from app.core.config import Settings, get_settings
+from app.core.resp import RespClient, RespError
+from app.dao import BuildingRecord, OrganizationRecord
+from app.db.versioning import data_versions
+
+T = TypeVar("T")
+
+
+class CacheBackend(Protocol):
+    name: str
+    # Blocking backends are called through a worker thread when running on the event loop.
+    blocking: bool
+
+    def get(self, key: str) -> Any | None: ...
+
+    def set(self, key: str, value: Any, ttl: int) -> None: ...
+
+    def delete(self, keys: list[str]) -> None: ...
+
+    def clear(self, prefix: str) -> None: ...
+
+    def size(self) -> int | None: ...
+
+
+class MemoryCacheBackend:
+    """Per-process LRU with a TTL per entry; values are stored as-is."""
+
+    name = "memory"
+    blocking = False
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, keys: list[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def size(self) -> int | None:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Shared backend over RESP; values go through ``encode``/``decode`` as bytes."""
+
+    name = "redis"
+    blocking = True
+
+    def __init__(self, client: RespClient, encode: Callable[[Any], bytes], decode: Callable[[bytes], Any]):
+        self.client = client
+        self.encode = encode
+        self.decode = decode
+
+    def get(self, key: str) -> Any | None:
+        raw = self.client.execute("GET", key)
+        return None if raw is None else self.decode(raw)
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self.client.execute("SET", key, self.encode(value), "EX", ttl)
+
+    def delete(self, keys: list[str]) -> None:
+        if keys:
+            self.client.execute("DEL", *keys)
+
+    def clear(self, prefix: str) -> None:
+        cursor = b"0"
+        while True:
+            cursor, keys = self.client.execute("SCAN", cursor, "MATCH", f"{prefix}*", "COUNT", 1000)
+            self.delete(keys)
+            if cursor == b"0":
+                return
+
+    def size(self) -> int | None:
+        # Counting one namespace would need a full SCAN; not worth it for metrics.
+        return None
+
+
+class CacheStats:
+    __slots__ = ("hits", "misses", "coalesced", "invalidations", "errors")
+
+    def __init__(self) -> None:
+        self.hits = self.misses = self.coalesced = self.invalidations = self.errors = 0
+
+
+class EntityCache(Generic[T]):
+    """Read-through cache of single entities by id; concurrent misses for a key are coalesced."""
+
+    def __init__(self, backend: CacheBackend, namespace: str, ttl: int):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._inflight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a load that overlaps one is not stored.
+        self._generation = 0
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _backend_call(self, method: Callable[..., Any], *args: Any) -> Any:
+        try:
+            if self.backend.blocking and in_greenlet():
+                return await_only(asyncio.to_thread(method, *args))
+            return method(*args)
+        except (OSError, RespError):
+            self.stats.errors += 1
+            return None
+
+    @staticmethod
+    def _wait(future: Future) -> Any:
+        if in_greenlet():
+            # Async mode: yield to the event loop instead of blocking it.
+            return await_only(asyncio.wrap_future(future))
+        return future.result()
+
+    def get(self, key: Hashable, loader: Callable[[], T | None]) -> T | None:
+        value = self._backend_call(self.backend.get, self._key(key))
+        if value is not None:
+            self.stats.hits += 1
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                generation = self._generation
+        if not leader:
+            self.stats.coalesced += 1
+            return self._wait(future)
+
+        self.stats.misses += 1
+        try:
+            value = loader()
+            if value is not None and generation == self._generation:
+                self._backend_call(self.backend.set, self._key(key), value, self.ttl)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def invalidate(self, keys: frozenset[Hashable] | None = None) -> None:
+        """Evict ``keys``, or every entry of the namespace when ``keys`` is ``None``."""
+        with self._lock:
+            self._generation += 1
+        self.stats.invalidations += 1
+        if keys is None:
+            self._backend_call(self.backend.clear, f"{self.namespace}:")
+        else:
+            self._backend_call(self.backend.delete, [self._key(key) for key in keys])
+
+
+def _datetime(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def encode_organization(record: OrganizationRecord) -> bytes:
+    building = record.building
+    return json.dumps(
+        [
+            record.id,
+            record.name,
+            _isoformat(record.created_at),
+            [building.id, building.address, building.latitude, building.longitude, _isoformat(building.created_at)],
+            record.phone_numbers,
+            record.activity_ids,
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def decode_organization(raw: bytes) -> OrganizationRecord:
+    organization_id, name, created_at, building, phone_numbers, activity_ids = json.loads(raw)
+    building_id, address, latitude, longitude, building_created_at = building
+    return OrganizationRecord(
+        organization_id,
+        name,
+        building_id,
+        _datetime(created_at),
+        BuildingRecord(building_id, address, latitude, longitude, _datetime(building_created_at)),
+        tuple(phone_numbers),
+        tuple(activity_ids),
+    )
+
+
+ORGANIZATION_NAMESPACE = "organization"
+
+
+def _build_backend(settings: Settings) -> CacheBackend:
+    if settings.entity_cache_backend == "redis":
+        return RedisCacheBackend(RespClient(settings.entity_cache_redis_url), encode_organization, decode_organization)
+    return MemoryCacheBackend(settings.entity_cache_max_entries)
+
+
+@lru_cache
+def get_organization_cache() -> EntityCache[OrganizationRecord] | None:
+    """Process-wide cache of organization cards, or ``None`` when ENTITY_CACHE_BACKEND is ``none``."""
+    settings = get_settings()
+    if settings.entity_cache_backend == "none":
+        return None
+    cache: EntityCache[OrganizationRecord] = EntityCache(
+        _build_backend(settings), ORGANIZATION_NAMESPACE, settings.entity_cache_ttl
+    )
+
+    def on_change(scope: str, keys: frozenset[int] | None) -> None:
+        # Cards embed their building, so any building change drops them all.
+        if scope == "organizations":
+            cache.invalidate(keys)
+        elif scope == "buildings":
+            cache.invalidate()
+
+    data_versions.subscribe(on_change)
+    return cache
+
+
+def clear_shared_organization_cache(settings: Settings) -> None:
+    """Drop every organization card from the Redis cache after a write from outside the app."""
+    if settings.entity_cache_backend != "redis":
+        return
+    client = RespClient(settings.entity_cache_redis_url)
+    try:
+        RedisCacheBackend(client, encode_organization, decode_organization).clear(f"{ORGANIZATION_NAMESPACE}:")
+    except (OSError, RespError):
+        # Unreachable cache: its entries still expire after ENTITY_CACHE_TTL.
+        pass
+    finally:
+        client.close()
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+
+from app.dao import OrganizationDAO
+from app.db.versioning import data_versions
+from app.services.cache import LoaderLock
+
+
+def fold(value: str) -> str:
+    return value.casefold()
+
+
+class NameNgramIndex:
+    """Case-folded n-gram index over organization names, in name order, with a delta segment for updates."""
+
+    __slots__ = (
+        "n",
+        "version",
+        "_ids",
+        "_names",
+        "_folded",
+        "_postings",
+        "_ids_sorted",
+        "_positions_by_id",
+        "_overlay",
+    )
+
+    def __init__(self, rows: Iterable[tuple[int, str]], *, n: int = 3, version: int = 0):
+        self.n = n
+        self.version = version
+        ordered = sorted(rows, key=lambda row: row[1])
+        self._ids = array("q", (organization_id for organization_id, _ in ordered))
+        self._names = [name for _, name in ordered]
+        self._folded = [fold(name) for name in self._names]
+        self._postings: dict[str, array] = {}
+        for position, folded in enumerate(self._folded):
+            for gram in set(self._grams(folded)):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[gram] = array("I")
+                posting.append(position)
+
+        by_id = sorted(range(len(self._ids)), key=self._ids.__getitem__)
+        self._ids_sorted = array("q", (self._ids[position] for position in by_id))
+        self._positions_by_id = array("I", by_id)
+        # (tombstoned positions, id -> (name, folded name)) swapped as one object.
+        self._overlay: tuple[set[int], dict[int, tuple[str, str]]] = (set(), {})
+
+    def __len__(self) -> int:
+        tombstones, delta = self._overlay
+        return len(self._ids) - len(tombstones) + len(delta)
+
+    @property
+    def delta_size(self) -> int:
+        tombstones, delta = self._overlay
+        return len(tombstones) + len(delta)
+
+    def _grams(self, folded: str) -> Iterable[str]:
+        return (folded[start : start + self.n] for start in range(len(folded) - self.n + 1))
+
+    def _position(self, organization_id: int) -> int | None:
+        index = bisect_left(self._ids_sorted, organization_id)
+        if index < len(self._ids_sorted) and self._ids_sorted[index] == organization_id:
+            return self._positions_by_id[index]
+        return None
+
+    def search(self, query: str, limit: int) -> list[int] | None:
+        """Ids of names containing ``query`` in name order; ``None`` if the query is too short to index."""
+        folded_query = fold(query.strip())
+        if len(folded_query) < self.n:
+            return None
+
+        postings = []
+        for gram in set(self._grams(folded_query)):
+            posting = self._postings.get(gram)
+            if posting is None:
+                postings = []
+                break
+            postings.append(posting)
+
+        tombstones, delta = self._overlay
+        matches: list[tuple[str, int]] = []
+        if postings:
+            driver = min(postings, key=len)
+            for position in driver:
+                if position in tombstones or folded_query not in self._folded[position]:
+                    continue
+                matches.append((self._names[position], self._ids[position]))
+                if len(matches) >= limit:
+                    break
+
+        if delta:
+            matches.extend(
+                (name, organization_id)
+                for organization_id, (name, folded) in delta.items()
+                if folded_query in folded
+            )
+            matches.sort()
+        return [organization_id for _, organization_id in matches[:limit]]
+
+    def apply(self, changed_ids: set[int], rows: Iterable[tuple[int, str]], version: int) -> None:
+        """Replace the entries of ``changed_ids`` with ``rows``; ids absent from ``rows`` were deleted."""
+        tombstones, delta = set(self._overlay[0]), dict(self._overlay[1])
+        for organization_id in changed_ids:
+            delta.pop(organization_id, None)
+            position = self._position(organization_id)
+            if position is not None:
+                tombstones.add(position)
+        for organization_id, name in rows:
+            delta[organization_id] = (name, fold(name))
+        self._overlay = (tombstones, delta)
+        self.version = version
+
+
+class _IndexHolder:
+    def __init__(self) -> None:
+        self.index: NameNgramIndex | None = None
+        self.lock = LoaderLock()
+
+
+_holder = _IndexHolder()
+
+# Past this many delta entries or tombstones the index is rebuilt from scratch.
+MAX_DELTA_SIZE = 10_000
+
+
+def get_name_index(organization_dao: OrganizationDAO) -> NameNgramIndex:
+    """Return the process-wide name index, catching up with organization writes first."""
+    version = data_versions.current("organizations")
+    index = _holder.index
+    if index is not None and index.version == version:
+        return index
+
+    with _holder.lock:
+        index = _holder.index
+        if index is not None and index.version != version:
+            changed_ids = data_versions.changes_since("organizations", index.version)
+            if changed_ids is not None and index.delta_size + len(changed_ids) <= MAX_DELTA_SIZE:
+                index.apply(changed_ids, organization_dao.list_names(sorted(changed_ids)), version)
+            else:
+                index = None
+        if index is None:
+            index = _holder.index = NameNgramIndex(organization_dao.list_names(), version=version)
+        return index
@@ -1,19 +1,101 @@
-from app.dao import OrganizationDAO
+from app.core.config import get_settings
+from app.core.geo import approximate_bounding_box
+from app.dao import BuildingDAO, OrganizationDAO, OrganizationFilters, OrganizationResult
+from app.services.entity_cache import EntityCache
 from app.services.exceptions import NotFoundError, ValidationError
-from app.services.geo import approximate_bounding_box, haversine_km
+from app.services.name_index import get_name_index
+from app.services.pagination import Page, paginate
+from app.services.spatial_index import get_building_index
+
+# Buildings per query in nearby search; each id is bound twice (IN list and rank).
+NEARBY_BUILDING_CHUNK = 500
+
+
+def rectangle_bounds(
+    min_latitude: float | None,
+    max_latitude: float | None,
+    min_longitude: float | None,
+    max_longitude: float | None,
+) -> tuple[float, float, float, float] | None:
+    """Optional bounding box filter: all four bounds or none of them."""
+    bounds = (min_latitude, max_latitude, min_longitude, max_longitude)
+    if all(bound is None for bound in bounds):
+        return None
+    if any(bound is None for bound in bounds):
+        raise ValidationError("Provide all of min_latitude, max_latitude, min_longitude, max_longitude.")
+    if min_latitude > max_latitude or min_longitude > max_longitude:
+        raise ValidationError("Minimum bounds must not exceed maximum bounds.")
+    return bounds
 
 
 class OrganizationService:
-    def __init__(self, organization_dao: OrganizationDAO):
+    def __init__(
+        self,
+        organization_dao: OrganizationDAO,
+        building_dao: BuildingDAO,
+        cache: EntityCache | None = None,
+    ):
         self.organization_dao = organization_dao
+        self.building_dao = building_dao
+        # Entities only, so the cache is bypassed for a DAO returning tracked ORM instances.
+        self.cache = cache if organization_dao.readonly else None
 
     def get_organization(self, organization_id: int):
-        organization = self.organization_dao.get(organization_id)
+        if self.cache is not None:
+            organization = self.cache.get(organization_id, lambda: self.organization_dao.get(organization_id))
+        else:
+            organization = self.organization_dao.get(organization_id)
         if not organization:
             raise NotFoundError("Organization not found")
         return organization
 
+    def get_organizations(self, organization_ids: list[int]) -> tuple[list[OrganizationResult], list[int]]:
+        """Organizations in request order (duplicates collapsed) and the ids that do not exist."""
+        requested = list(dict.fromkeys(organization_ids))
+        found = self.organization_dao.get_many(requested)
+        organizations = [found[organization_id] for organization_id in requested if organization_id in found]
+        missing = [organization_id for organization_id in requested if organization_id not in found]
+        return organizations, missing
+
+    def list_organizations(
+        self,
+        *,
+        building_id: int | None = None,
+        activity_id: int | None = None,
+        query: str | None = None,
+        latitude: float | None = None,
+        longitude: float | None = None,
+        radius_km: float | None = None,
+        min_latitude: float | None = None,
+        max_latitude: float | None = None,
+        min_longitude: float | None = None,
+        max_longitude: float | None = None,
+        limit: int,
+        cursor: str | None = None,
+    ) -> Page:
+        """Organizations matching every given filter, by name; an unknown building or activity matches nothing."""
+        if radius_km is not None and (latitude is None or longitude is None):
+            raise ValidationError("Provide latitude and longitude with radius_km.")
+        if radius_km is None and (latitude is not None or longitude is not None):
+            raise ValidationError("Provide radius_km with latitude and longitude.")
+        filters = OrganizationFilters(
+            building_id=building_id,
+            activity_id=activity_id,
+            query=query.strip() if query is not None else None,
+            bounds=rectangle_bounds(min_latitude, max_latitude, min_longitude, max_longitude),
+            radius=(latitude, longitude, radius_km) if radius_km is not None else None,
+        )
+        return paginate(
+            lambda page_size, after: self.organization_dao.list_filtered(filters, limit=page_size, after=after),
+            limit,
+            cursor,
+        )
+
     def search_organizations(self, query: str, limit: int):
+        if get_settings().name_index_enabled:
+            organization_ids = get_name_index(self.organization_dao).search(query, limit)
+            if organization_ids is not None:
+                return self.organization_dao.list_by_ids(organization_ids)
         return self.organization_dao.search_by_name(query, limit)
 
     def organizations_nearby(
@@ -27,7 +109,8 @@ class OrganizationService:
         min_longitude: float | None,
         max_longitude: float | None,
         limit: int,
-    ):
+    ) -> list[tuple[OrganizationResult, float]]:
+        """Organizations nearest first, each with its distance in km rounded to metres."""
         if radius_km is None:
             if None in {min_latitude, max_latitude, min_longitude, max_longitude}:
                 raise ValidationError("Provide either radius_km or full rectangular bounds.")
@@ -36,28 +119,43 @@ class OrganizationService:
                 latitude, longitude, radius_km
             )
 
-        limit_multiplier = 5 if radius_km is not None else 1
-        candidates = self.organization_dao.list_in_rectangle(
+        settings = get_settings()
+        if settings.nearby_backend == "database":
+            matches = self.organization_dao.list_nearby(
+                latitude,
+                longitude,
+                min_latitude=min_latitude,
+                max_latitude=max_latitude,
+                min_longitude=min_longitude,
+                max_longitude=max_longitude,
+                radius_km=radius_km,
+                limit=limit,
+            )
+            return [(organization, round(distance, 3)) for organization, distance in matches]
+
+        index = get_building_index(self.building_dao, settings.spatial_index_cell_degrees)
+        building_matches = index.within_rectangle(
             min_latitude,
             max_latitude,
             min_longitude,
             max_longitude,
-            limit * limit_multiplier,
+            origin=(latitude, longitude),
+            max_distance_km=radius_km,
         )
+        return self._organizations_by_distance(building_matches, limit)
 
-        if radius_km is None:
-            return candidates[:limit]
-
-        filtered = []
-        for organization in candidates:
-            distance = haversine_km(
-                latitude,
-                longitude,
-                organization.building.latitude,
-                organization.building.longitude,
+    def _organizations_by_distance(
+        self, matches: list[tuple[int, float]], limit: int
+    ) -> list[tuple[OrganizationResult, float]]:
+        # Buildings arrive nearest first; each chunk asks the DAO only for the organizations still missing.
+        results: list[tuple[OrganizationResult, float]] = []
+        for start in range(0, len(matches), NEARBY_BUILDING_CHUNK):
+            distances = dict(matches[start : start + NEARBY_BUILDING_CHUNK])
+            organizations = self.organization_dao.list_by_building_ids(list(distances), limit=limit - len(results))
+            results.extend(
+                (organization, round(distances[organization.building_id], 3)) for organization in organizations
             )
-            if distance <= radius_km:
-                filtered.append(organization)
-            if len(filtered) >= limit:
+            if len(results) >= limit:
                 break
-        return filtered
+        return results
+        return results
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from typing import Generic, TypeVar
+
+from app.services.exceptions import ValidationError
+
+T = TypeVar("T")
+
+
+class Page(Generic[T]):
+    __slots__ = ("items", "next_cursor")
+
+    def __init__(self, items: list[T], next_cursor: str | None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+
+def encode_cursor(name: str, entity_id: int) -> str:
+    raw = json.dumps([name, entity_id], ensure_ascii=False, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str | None) -> tuple[str, int] | None:
+    """Decode an opaque ``(name, id)`` keyset cursor; ``None`` means the first page."""
+    if cursor is None:
+        return None
+    try:
+        name, entity_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise ValidationError("Invalid cursor") from exc
+    if not isinstance(name, str) or not isinstance(entity_id, int):
+        raise ValidationError("Invalid cursor")
+    return name, entity_id
+
+
+def name_id_key(entity) -> tuple[str, int]:
+    return entity.name, entity.id
+
+
+def paginate(
+    fetch: Callable[[int, tuple[str, int] | None], Sequence[T]],
+    limit: int,
+    cursor: str | None,
+    key: Callable[[T], tuple[str, int]] = name_id_key,
+) -> Page[T]:
+    """Run a keyset ``fetch(limit + 1, after)`` and turn the extra row into ``next_cursor``."""
+    rows = list(fetch(limit + 1, decode_cursor(cursor)))
+    if len(rows) <= limit:
+        return Page(rows, None)
+    items = rows[:limit]
+    return Page(items, encode_cursor(*key(items[-1])))
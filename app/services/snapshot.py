@@ -0,0 +1,14 @@
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.dao import DirectorySnapshot
+from app.services.cache import VersionedCache
+
+_snapshot_cache: VersionedCache[DirectorySnapshot] = VersionedCache("activities", "buildings", "organizations")
+
+
+def current_snapshot(db: Session) -> DirectorySnapshot | None:
+    """The in-memory directory, reloaded through ``db`` after writes; ``None`` unless READ_SNAPSHOT_ENABLED."""
+    if not get_settings().read_snapshot_enabled:
+        return None
+    return _snapshot_cache.get(lambda: DirectorySnapshot.load(db))
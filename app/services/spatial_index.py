@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from math import floor
+
+from app.dao import BuildingDAO
+from app.db.versioning import data_versions
+from app.core.geo import bounding_box_mask, haversine_km_many
+from app.services.cache import LoaderLock
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+
+class BuildingGridIndex:
+    """Uniform lat/lon grid over building coordinates."""
+
+    __slots__ = ("cell_size", "_ids", "_latitudes", "_longitudes", "_cells")
+
+    def __init__(self, points: Iterable[tuple[int, float, float]], cell_size: float = 0.05):
+        self.cell_size = cell_size
+        self._ids = array("q")
+        self._latitudes = array("d")
+        self._longitudes = array("d")
+        self._cells: dict[tuple[int, int], array] = {}
+
+        for building_id, latitude, longitude in points:
+            position = len(self._ids)
+            self._ids.append(building_id)
+            self._latitudes.append(latitude)
+            self._longitudes.append(longitude)
+            cell = self._cell(latitude, longitude)
+            bucket = self._cells.get(cell)
+            if bucket is None:
+                bucket = self._cells[cell] = array("I")
+            bucket.append(position)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return floor(latitude / self.cell_size), floor(longitude / self.cell_size)
+
+    def _candidate_buckets(
+        self, min_latitude: float, max_latitude: float, min_longitude: float, max_longitude: float
+    ) -> list[array]:
+        min_row, min_col = self._cell(min_latitude, min_longitude)
+        max_row, max_col = self._cell(max_latitude, max_longitude)
+        if (max_row - min_row + 1) * (max_col - min_col + 1) > len(self._cells):
+            # Huge boxes cover more grid cells than are occupied: walk the occupied ones.
+            return [
+                bucket
+                for (row, col), bucket in self._cells.items()
+                if min_row <= row <= max_row and min_col <= col <= max_col
+            ]
+        return [
+            self._cells[(row, col)]
+            for row in range(min_row, max_row + 1)
+            for col in range(min_col, max_col + 1)
+            if (row, col) in self._cells
+        ]
+
+    def points_in_rectangle(
+        self, min_latitude: float, max_latitude: float, min_longitude: float, max_longitude: float
+    ) -> tuple:
+        """``(ids, latitudes, longitudes)`` of the buildings inside the box (inclusive)."""
+        buckets = self._candidate_buckets(min_latitude, max_latitude, min_longitude, max_longitude)
+        if np is not None:
+            if not buckets:
+                return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0)
+            positions = np.concatenate([np.frombuffer(bucket, dtype=np.uint32) for bucket in buckets])
+            latitudes = np.frombuffer(self._latitudes, dtype=np.float64)[positions]
+            longitudes = np.frombuffer(self._longitudes, dtype=np.float64)[positions]
+            mask = bounding_box_mask(latitudes, longitudes, min_latitude, max_latitude, min_longitude, max_longitude)
+            return np.frombuffer(self._ids, dtype=np.int64)[positions[mask]], latitudes[mask], longitudes[mask]
+
+        positions = [position for bucket in buckets for position in bucket]
+        latitudes = [self._latitudes[position] for position in positions]
+        longitudes = [self._longitudes[position] for position in positions]
+        mask = bounding_box_mask(latitudes, longitudes, min_latitude, max_latitude, min_longitude, max_longitude)
+        positions = [position for position, inside in zip(positions, mask) if inside]
+        return (
+            [self._ids[position] for position in positions],
+            [self._latitudes[position] for position in positions],
+            [self._longitudes[position] for position in positions],
+        )
+
+    def within_rectangle(
+        self,
+        min_latitude: float,
+        max_latitude: float,
+        min_longitude: float,
+        max_longitude: float,
+        *,
+        origin: tuple[float, float],
+        max_distance_km: float | None = None,
+    ) -> list[tuple[int, float]]:
+        """Return ``(building_id, distance_km)`` pairs inside the box, nearest to ``origin`` first."""
+        ids, latitudes, longitudes = self.points_in_rectangle(min_latitude, max_latitude, min_longitude, max_longitude)
+        if not len(ids):
+            return []
+
+        distances = haversine_km_many(origin[0], origin[1], latitudes, longitudes)
+        if np is not None:
+            if max_distance_km is not None:
+                within = distances <= max_distance_km
+                ids, distances = ids[within], distances[within]
+            order = np.argsort(distances, kind="stable")
+            return list(zip(ids[order].tolist(), distances[order].tolist()))
+
+        matches = [
+            (building_id, distance)
+            for building_id, distance in zip(ids, distances)
+            if max_distance_km is None or distance <= max_distance_km
+        ]
+        matches.sort(key=lambda match: match[1])
+        return matches
+
+
+class _IndexHolder:
+    def __init__(self) -> None:
+        self.index: BuildingGridIndex | None = None
+        self.version = -1
+        self.lock = LoaderLock()
+
+
+_holder = _IndexHolder()
+
+
+def get_building_index(building_dao: BuildingDAO, cell_size: float = 0.05) -> BuildingGridIndex:
+    """Return the process-wide building index, rebuilding it after building writes."""
+    version = data_versions.current("buildings")
+    index = _holder.index
+    if index is not None and _holder.version == version and index.cell_size == cell_size:
+        return index
+
+    with _holder.lock:
+        if _holder.index is None or _holder.version != version or _holder.index.cell_size != cell_size:
+            _holder.index = BuildingGridIndex(building_dao.list_coordinates(), cell_size=cell_size)
+            _holder.version = version
+        return _holder.index
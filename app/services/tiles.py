@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+
+from app.core.geo import tile_bounds, tile_coordinates
+from app.schemas.building import BuildingClusterRead, BuildingTileRead
+from app.services.cache import VersionedCache
+from app.services.spatial_index import BuildingGridIndex
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+
+def cluster_tile(index: BuildingGridIndex, zoom: int, x: int, y: int, grid: int) -> list[BuildingClusterRead]:
+    """Cluster one tile's buildings on a ``grid`` x ``grid`` raster; tile edges are half-open, map edges closed."""
+    tiles = 2**zoom
+    min_latitude, max_latitude, min_longitude, max_longitude = tile_bounds(zoom, x, y)
+    if y == 0:
+        max_latitude = 90.0
+    if y == tiles - 1:
+        min_latitude = -90.0
+    ids, latitudes, longitudes = index.points_in_rectangle(min_latitude, max_latitude, min_longitude, max_longitude)
+    xs, ys = tile_coordinates(zoom, latitudes, longitudes)
+    # Longitude 180 and the clamped southern limit land exactly on ``tiles``; keep them in the last tile.
+    edge = math.nextafter(tiles, 0)
+
+    if np is not None:
+        columns, rows = np.clip(xs, 0, edge) - x, np.clip(ys, 0, edge) - y
+        inside = (columns >= 0) & (columns < 1) & (rows >= 0) & (rows < 1)
+        cells = (rows[inside] * grid).astype(np.int64) * grid + (columns[inside] * grid).astype(np.int64)
+        counts = np.bincount(cells, minlength=grid * grid)
+        latitude_sums = np.bincount(cells, weights=latitudes[inside], minlength=grid * grid)
+        longitude_sums = np.bincount(cells, weights=longitudes[inside], minlength=grid * grid)
+        # Only read for cells holding a single building, where the one id written is that building's.
+        cell_ids = np.zeros(grid * grid, dtype=np.int64)
+        cell_ids[cells] = ids[inside]
+        occupied = np.flatnonzero(counts)
+        aggregates = zip(
+            counts[occupied].tolist(),
+            latitude_sums[occupied].tolist(),
+            longitude_sums[occupied].tolist(),
+            cell_ids[occupied].tolist(),
+        )
+    else:
+        cells: dict[int, list] = {}
+        for building_id, latitude, longitude, column, row in zip(ids, latitudes, longitudes, xs, ys):
+            column, row = min(max(column, 0), edge) - x, min(max(row, 0), edge) - y
+            if not (0 <= column < 1 and 0 <= row < 1):
+                continue
+            cell = cells.setdefault(int(row * grid) * grid + int(column * grid), [0, 0.0, 0.0, building_id])
+            cell[0] += 1
+            cell[1] += latitude
+            cell[2] += longitude
+        aggregates = (cells[cell] for cell in sorted(cells))
+
+    return [
+        BuildingClusterRead(
+            latitude=round(latitude_sum / count, 6),
+            longitude=round(longitude_sum / count, 6),
+            count=count,
+            building_id=building_id if count == 1 else None,
+        )
+        for count, latitude_sum, longitude_sum, building_id in aggregates
+    ]
+
+
+class BuildingTile:
+    """One clustered tile, pre-serialized for conditional responses."""
+
+    __slots__ = ("json", "digest")
+
+    def __init__(self, zoom: int, x: int, y: int, clusters: list[BuildingClusterRead]):
+        tile = BuildingTileRead(
+            zoom=zoom, x=x, y=y, count=sum(cluster.count for cluster in clusters), clusters=clusters
+        )
+        self.json: bytes = tile.model_dump_json().encode()
+        self.digest = hashlib.sha256(self.json).hexdigest()[:32]
+
+
+class TileStore:
+    """LRU of rendered tiles for one version of the buildings."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._tiles: OrderedDict[tuple[int, int, int], BuildingTile] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[int, int, int]) -> BuildingTile | None:
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+            return tile
+
+    def put(self, key: tuple[int, int, int], tile: BuildingTile) -> None:
+        with self._lock:
+            self._tiles[key] = tile
+            while len(self._tiles) > self.max_entries:
+                self._tiles.popitem(last=False)
+
+
+# A new store per buildings version: any building write drops every tile at once.
+_tile_cache: VersionedCache[TileStore] = VersionedCache("buildings")
+
+
+def tile_store(max_entries: int) -> TileStore:
+    return _tile_cache.get(lambda: TileStore(max_entries))
+
+
+def cached_building_tile(zoom: int, x: int, y: int) -> BuildingTile | None:
+    """The tile if it is already rendered for the current buildings, without touching the database."""
+    store = _tile_cache.peek()
+    return store.get((zoom, x, y)) if store is not None else None
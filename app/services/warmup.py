@@ -0,0 +1,32 @@
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.core.config import Settings
+from app.dao import ActivityDAO, BuildingDAO, OrganizationDAO
+from app.services.activity_service import load_activity_tree
+from app.services.name_index import get_name_index
+from app.services.snapshot import current_snapshot
+from app.services.spatial_index import get_building_index
+
+# Set once this process has built its read structures; backs the readiness probe.
+warmed_up = threading.Event()
+
+
+def warm_up(db: Session, settings: Settings) -> None:
+    """Build the shared in-memory read structures; a repeated call rebuilds only what changed."""
+    snapshot = current_snapshot(db)
+    if snapshot is not None:
+        # The other structures are then built from the snapshot, not the database.
+        activity_dao, building_dao, organization_dao = (
+            snapshot.activity_dao,
+            snapshot.building_dao,
+            snapshot.organization_dao,
+        )
+    else:
+        activity_dao, building_dao, organization_dao = ActivityDAO(db), BuildingDAO(db), OrganizationDAO(db)
+    load_activity_tree(activity_dao)
+    if settings.nearby_backend == "memory":
+        get_building_index(building_dao, settings.spatial_index_cell_degrees)
+    if settings.name_index_enabled:
+        get_name_index(organization_dao)
@@ -1,7 +1,7 @@
 #!/bin/sh
 set -eu
 
-alembic upgrade head
-python scripts/seed_data.py
+# Migrates and seeds only when the database is behind; a no-op on restarts.
+python scripts/prestart.py
 
 exec "$@"
@@ -0,0 +1,29 @@
+"""Production server: ``gunicorn app.main:app`` picks this file up from the working directory.
+
+Uvicorn workers, one per CPU unless WEB_CONCURRENCY says otherwise, forked
+from a master that has already imported the app and built its read
+structures (see ``app/core/server.py``). SIGHUP, sent by hand or by the data
+version watcher, rebuilds them and replaces the workers without dropping
+requests.
+"""
+
+from app.core import server
+from app.core.config import get_settings
+
+settings = get_settings()
+
+bind = "0.0.0.0:8000"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = server.worker_count(settings)
+preload_app = True
+# Time old workers get to finish in-flight requests on reload and shutdown.
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(arbiter) -> None:
+    server.on_master_ready(settings)
+
+
+def on_reload(arbiter) -> None:
+    server.on_master_reload(settings)
@@ -0,0 +1,82 @@
+"""Microbenchmark: scalar ``haversine_km`` loop vs. the batch helpers in ``app.core.geo``.
+
+Usage: python scripts/bench_geo.py [--sizes 1000 10000 100000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import sys
+import timeit
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.core import geo
+
+ORIGIN = (55.7522, 37.6156)
+RADIUS_KM = 25.0
+
+
+def scalar_filter(latitudes: list[float], longitudes: list[float]) -> list[tuple[int, float]]:
+    lat, lon = ORIGIN
+    min_lat, max_lat, min_lon, max_lon = geo.approximate_bounding_box(lat, lon, RADIUS_KM)
+    matches = []
+    for position, (other_lat, other_lon) in enumerate(zip(latitudes, longitudes)):
+        if not (min_lat <= other_lat <= max_lat and min_lon <= other_lon <= max_lon):
+            continue
+        distance = geo.haversine_km(lat, lon, other_lat, other_lon)
+        if distance <= RADIUS_KM:
+            matches.append((position, distance))
+    matches.sort(key=lambda match: match[1])
+    return matches
+
+
+def batch_filter(latitudes, longitudes) -> list[tuple[int, float]]:
+    lat, lon = ORIGIN
+    mask = geo.bounding_box_mask(latitudes, longitudes, *geo.approximate_bounding_box(lat, lon, RADIUS_KM))
+    if geo.np is not None:
+        positions = geo.np.flatnonzero(mask)
+        distances = geo.haversine_km_many(lat, lon, latitudes[positions], longitudes[positions])
+        within = distances <= RADIUS_KM
+        positions, distances = positions[within], distances[within]
+        order = geo.np.argsort(distances, kind="stable")
+        return list(zip(positions[order].tolist(), distances[order].tolist()))
+
+    positions = [position for position, inside in enumerate(mask) if inside]
+    distances = geo.haversine_km_many(
+        lat, lon, [latitudes[position] for position in positions], [longitudes[position] for position in positions]
+    )
+    matches = [(position, distance) for position, distance in zip(positions, distances) if distance <= RADIUS_KM]
+    matches.sort(key=lambda match: match[1])
+    return matches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(42)
+    print(f"backend: {'numpy ' + geo.np.__version__ if geo.np is not None else 'pure python'}")
+    print(f"{'points':>10} {'scalar ms':>12} {'batch ms':>12} {'speedup':>8}")
+    for size in args.sizes:
+        latitudes = [ORIGIN[0] + random.gauss(0, 0.5) for _ in range(size)]
+        longitudes = [ORIGIN[1] + random.gauss(0, 0.8) for _ in range(size)]
+        columns = (
+            (geo.np.asarray(latitudes), geo.np.asarray(longitudes)) if geo.np is not None else (latitudes, longitudes)
+        )
+        expected = scalar_filter(latitudes, longitudes)
+        actual = batch_filter(*columns)
+        assert [position for position, _ in expected] == [position for position, _ in actual]
+
+        scalar = min(timeit.repeat(lambda: scalar_filter(latitudes, longitudes), number=1, repeat=args.repeat))
+        batch = min(timeit.repeat(lambda: batch_filter(*columns), number=1, repeat=args.repeat))
+        print(f"{size:>10} {scalar * 1000:>12.3f} {batch * 1000:>12.3f} {scalar / batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
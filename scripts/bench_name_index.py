@@ -0,0 +1,78 @@
+"""Build time, memory and query latency of the in-memory organization name index.
+
+Usage: python scripts/bench_name_index.py [--size 1000000] [--queries 200]
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import resource
+import statistics
+import sys
+import time
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.services.name_index import NameNgramIndex
+
+PREFIXES = ["ООО", "ЗАО", "АО", "ИП", "ПАО", "НКО"]
+WORDS = [
+    "Рога", "Копыта", "Сытный", "Дом", "Авто", "Макс", "Груз", "Лайн", "Молоко", "Мясо", "Север", "Юг",
+    "Восток", "Запад", "Строй", "Торг", "Сервис", "Маркет", "Альфа", "Вега", "Омега", "Технологии",
+    "Логистик", "Фарм", "Пром", "Снаб", "Хлеб", "Сад", "Лес", "Сталь", "Энерго", "Трейд",
+]
+
+
+def generate_names(size: int) -> list[tuple[int, str]]:
+    rng = random.Random(42)
+    return [
+        (organization_id, f"{rng.choice(PREFIXES)} {' '.join(rng.sample(WORDS, 2))} {organization_id}")
+        for organization_id in range(1, size + 1)
+    ]
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = generate_names(args.size)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    index = NameNgramIndex(rows)
+    build_seconds = time.perf_counter() - started
+    # ru_maxrss is reported in KiB on Linux; the delta approximates the index footprint.
+    memory_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+    print(f"names: {len(index)}  build: {build_seconds:.1f}s  peak RSS growth: {memory_mb:.0f} MiB")
+
+    rng = random.Random(7)
+    scenarios = {
+        "common word": lambda: rng.choice(WORDS).lower(),
+        "rare suffix": lambda: f"{rng.choice(WORDS)} {rng.randrange(1, args.size)}"[-7:],
+        "no match": lambda: "щщщ" + rng.choice(WORDS),
+    }
+    for label, make_query in scenarios.items():
+        samples = []
+        for _ in range(args.queries):
+            query = make_query()
+            started = time.perf_counter()
+            index.search(query, args.limit)
+            samples.append((time.perf_counter() - started) * 1000)
+        print(
+            f"{label:>12}: p50 {statistics.median(samples):.3f} ms  "
+            f"p95 {percentile(samples, 0.95):.3f} ms  max {max(samples):.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
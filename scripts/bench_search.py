@@ -0,0 +1,78 @@
+"""Query latency of the SQL organization name search backends on a seeded database.
+
+Times ``LIKE`` and the full-text backend of the database (FTS5 ``trigram`` on
+SQLite, ``pg_trgm`` on PostgreSQL) with the same queries, drawn from the stored
+names. Run it after ``python scripts/seed_data.py --buildings 20000 --organizations 1000000``
+and ``alembic upgrade head``; ``scripts/bench_name_index.py`` covers the in-memory index.
+
+Usage: python scripts/bench_search.py [--database-url URL] [--queries 100] [--limit 50]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import random
+import statistics
+import sys
+import time
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="Overrides DATABASE_URL")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+    # Settings are read once on import, so the environment has to be final before the app loads.
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from sqlalchemy import func, select
+
+    from app.dao.search import LikeSearchBackend, get_search_backend
+    from app.db.session import get_sessionmaker
+    from app.models import Organization
+
+    with get_sessionmaker()() as db:
+        total = db.scalar(select(func.count()).select_from(Organization))
+        rng = random.Random(7)
+        names = list(db.scalars(select(Organization.name).order_by(func.random()).limit(args.queries)))
+        if not names:
+            raise SystemExit("No organizations to search; seed the database first")
+        words = [word for name in names for word in name.split() if len(word) >= 3 and not word.isdigit()]
+        scenarios = {
+            "common word": [rng.choice(words).lower() for _ in names],
+            "rare suffix": [name[-7:] for name in names],
+            "no match": ["щщщ" + rng.choice(words) for _ in names],
+        }
+
+        backends = {"like": LikeSearchBackend()}
+        full_text = get_search_backend(db, "auto")
+        if not isinstance(full_text, LikeSearchBackend):
+            backends[type(full_text).__name__] = full_text
+        print(f"{db.get_bind().dialect.name}, {total} organizations, limit {args.limit}")
+        for backend_name, backend in backends.items():
+            for label, queries in scenarios.items():
+                samples = []
+                for query in queries:
+                    started = time.perf_counter()
+                    backend.search_ids(db, query, args.limit)
+                    samples.append((time.perf_counter() - started) * 1000)
+                print(
+                    f"{backend_name:>24} {label:>12}: p50 {statistics.median(samples):.2f} ms  "
+                    f"p95 {percentile(samples, 0.95):.2f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Microbenchmark: pydantic ``response_model`` path vs. the fast-path organization serializer.
+
+Builds in-memory organizations (no database), as ORM entities for the
+pydantic path and as the equivalent read-only records for the fast path,
+and checks that both encode to identical bytes before timing.
+
+Usage: python scripts/bench_serialization.py [--sizes 50 200 500] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import pathlib
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.responses import FastJSONResponse, json_dumps
+from app.dao import BuildingRecord, OrganizationRecord
+from app.models import Activity, Building, Organization, OrganizationPhone
+from app.schemas.organization import OrganizationNearbyRead
+from app.schemas.serializers import OrganizationSerializer
+from app.services.activity_service import ActivityTree
+
+NEARBY_FIELD = create_response_field(name="Response", type_=list[OrganizationNearbyRead])
+
+
+def build_activities() -> list[Activity]:
+    activities: list[Activity] = []
+    next_id = 1
+    for _ in range(4):
+        root = Activity(id=next_id, name=f"Activity {next_id}", parent_id=None, level=1)
+        activities.append(root)
+        next_id += 1
+        for _ in range(3):
+            child = Activity(id=next_id, name=f"Activity {next_id}", parent_id=root.id, level=2, parent=root)
+            activities.append(child)
+            next_id += 1
+            for _ in range(2):
+                activities.append(
+                    Activity(id=next_id, name=f"Activity {next_id}", parent_id=child.id, level=3, parent=child)
+                )
+                next_id += 1
+    return activities
+
+
+def build_matches(size: int, activities: list[Activity]) -> list[tuple[Organization, float]]:
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    buildings = [
+        Building(
+            id=number,
+            address=f"г. Москва, ул. Тестовая {number}",
+            latitude=55.75 + random.uniform(-0.1, 0.1),
+            longitude=37.6 + random.uniform(-0.1, 0.1),
+            created_at=created_at,
+        )
+        for number in range(1, size // 4 + 2)
+    ]
+    matches = []
+    for number in range(1, size + 1):
+        building = random.choice(buildings)
+        organization = Organization(
+            id=number,
+            name=f"ООО Организация {number}",
+            building_id=building.id,
+            building=building,
+            activities=sorted(random.sample(activities, 2), key=lambda activity: activity.id),
+            phones=[OrganizationPhone(phone_number=f"8-900-{number:03d}-00-0{digit}") for digit in range(2)],
+            created_at=created_at + timedelta(seconds=number, microseconds=number * 7),
+        )
+        matches.append((organization, round(random.uniform(0, 10), 3)))
+    matches.sort(key=lambda match: match[1])
+    return matches
+
+
+def as_records(matches) -> list[tuple[OrganizationRecord, float]]:
+    buildings: dict[int, BuildingRecord] = {}
+    records = []
+    for organization, distance in matches:
+        building = organization.building
+        if building.id not in buildings:
+            buildings[building.id] = BuildingRecord(
+                building.id, building.address, building.latitude, building.longitude, building.created_at
+            )
+        record = OrganizationRecord(
+            organization.id,
+            organization.name,
+            building.id,
+            organization.created_at,
+            buildings[building.id],
+            tuple(phone.phone_number for phone in organization.phones),
+            tuple(activity.id for activity in organization.activities),
+        )
+        records.append((record, distance))
+    return records
+
+
+def pydantic_path(matches, loop: asyncio.AbstractEventLoop) -> bytes:
+    content = [
+        OrganizationNearbyRead.model_validate(organization).model_copy(update={"distance_km": distance})
+        for organization, distance in matches
+    ]
+    payload = loop.run_until_complete(serialize_response(field=NEARBY_FIELD, response_content=content))
+    return JSONResponse(payload).body
+
+
+def fast_path(matches, tree: ActivityTree) -> bytes:
+    return FastJSONResponse(json_dumps(OrganizationSerializer(tree.payloads).nearby(matches))).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(42)
+    activities = build_activities()
+    tree = ActivityTree(sorted(activities, key=lambda activity: (activity.level, activity.name)))
+    loop = asyncio.new_event_loop()
+
+    print(f"{'rows':>8} {'pydantic ms':>12} {'fast ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        matches = build_matches(size, activities)
+        records = as_records(matches)
+        assert pydantic_path(matches, loop) == fast_path(records, tree), "fast path output differs"
+
+        slow = min(timeit.repeat(lambda: pydantic_path(matches, loop), number=1, repeat=args.repeat))
+        fast = min(timeit.repeat(lambda: fast_path(records, tree), number=1, repeat=args.repeat))
+        print(f"{size:>8} {slow * 1000:>12.3f} {fast * 1000:>10.3f} {slow / fast:>7.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
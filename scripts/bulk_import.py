@@ -0,0 +1,333 @@
+"""Stream a large registry (CSV or NDJSON) into the database in batches.
+
+Usage:
+    python scripts/bulk_import.py [--activities FILE] [--buildings FILE] [--organizations FILE]
+                                  [--batch-size 50000]
+
+The format is picked by extension (``.csv``, ``.ndjson``/``.jsonl``). Columns:
+
+- activities: ``name``, ``parent`` (empty for a root)
+- buildings: ``address``, ``latitude``, ``longitude``
+- organizations: ``name``, ``building`` (address), ``phones``, ``activities``
+  (``;``-separated in CSV, arrays in NDJSON)
+
+Everything runs in one transaction: activities are read and validated (known
+parents, depth <= 3) before anything is written, buildings and organizations
+are streamed through generators and written batch by batch with executemany,
+or ``COPY`` on PostgreSQL/psycopg2. Building and activity references resolve
+through in-memory maps, so the input itself is never held in memory.
+Activities, buildings and organizations that already exist (same name or
+address) are skipped, so a file can be imported again; an organization name
+repeated within the input is an error.
+
+The import advances the persisted data versions, so the production server
+(``gunicorn.conf.py``) reloads its workers; restart a plain uvicorn process by hand.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import pathlib
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from sqlalchemy import Connection, Table, func, insert, select, text
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover - orjson ships with fastapi's default extras
+    json_loads = json.loads
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.core.config import get_settings
+from app.dao.activity import rebuild_activity_closure
+from app.db.session import get_engine
+from app.db.versioning import bump_stored_versions
+from app.models import Activity, Building, Organization, OrganizationPhone, organization_activities
+from app.services.entity_cache import clear_shared_organization_cache
+
+MAX_ACTIVITY_LEVEL = 3
+LIST_SEPARATOR = ";"
+# Names per ``IN (...)`` lookup; stays under SQLite's bound parameter limit.
+NAME_LOOKUP_CHUNK = 5_000
+
+
+def read_records(path: pathlib.Path) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield ``(line number, record)`` from a CSV or NDJSON file, one at a time."""
+    with path.open(encoding="utf-8", newline="") as handle:
+        if path.suffix == ".csv":
+            # Line 1 is the header.
+            yield from enumerate(csv.DictReader(handle), start=2)
+        elif path.suffix in {".ndjson", ".jsonl"}:
+            for line_number, line in enumerate(handle, start=1):
+                if line.strip():
+                    yield line_number, json_loads(line)
+        else:
+            raise ValueError(f"{path}: unsupported format, expected .csv, .ndjson or .jsonl")
+
+
+def as_list(value: Any) -> list[str]:
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(LIST_SEPARATOR) if item.strip()]
+    return [str(item).strip() for item in value]
+
+
+def batched(records: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(records)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+class IdAllocator:
+    """Hands out primary keys up front so child rows can reference parents without RETURNING.
+
+    PostgreSQL reserves them from the table's sequence; SQLite has a single
+    writer, so counting up from ``max(id)`` inside the transaction is safe.
+    """
+
+    def __init__(self, connection: Connection, table: Table):
+        self.connection = connection
+        self.table = table
+        self.postgres = connection.dialect.name == "postgresql"
+        self._next = None if self.postgres else (connection.scalar(select(func.max(table.c.id))) or 0) + 1
+
+    def take(self, count: int) -> list[int]:
+        if self.postgres:
+            return list(
+                self.connection.scalars(
+                    text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) FROM generate_series(1, :count)"),
+                    {"table": self.table.name, "count": count},
+                )
+            )
+        ids = list(range(self._next, self._next + count))
+        self._next += count
+        return ids
+
+
+def write_rows(connection: Connection, table: Table, columns: tuple[str, ...], rows: list[tuple]) -> None:
+    """Insert positional ``rows`` with ``COPY`` on psycopg2, otherwise one DBAPI executemany."""
+    if not rows:
+        return
+    if connection.dialect.driver == "psycopg2":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+        return
+
+    # Bypass per-row bind processing; the values are already plain ints, floats and strings.
+    compiled = insert(table).compile(dialect=connection.dialect, column_keys=list(columns))
+    if compiled.positional:
+        order = [columns.index(key) for key in compiled.positiontup]
+        parameters = rows if order == list(range(len(columns))) else [tuple(row[i] for i in order) for row in rows]
+    else:
+        parameters = [dict(zip(columns, row)) for row in rows]
+    connection.exec_driver_sql(str(compiled), parameters)
+
+
+def plan_activities(
+    records: Iterable[tuple[int, dict[str, Any]]], known: dict[str, tuple[int, int]]
+) -> list[tuple[str, str | None, int]]:
+    """Order new activities parents-first and compute their levels, rejecting bad input up front."""
+    pending: dict[str, tuple[int, str | None]] = {}
+    for line_number, record in records:
+        name = (record.get("name") or "").strip()
+        parent = (record.get("parent") or "").strip() or None
+        if not name:
+            raise ValueError(f"activities line {line_number}: name is required")
+        if name in pending:
+            raise ValueError(f"activities line {line_number}: duplicate activity '{name}'")
+        if name not in known:
+            pending[name] = (line_number, parent)
+
+    levels = {name: level for name, (_, level) in known.items()}
+    planned: list[tuple[str, str | None, int]] = []
+    while pending:
+        ready = [name for name, (_, parent) in pending.items() if parent is None or parent in levels]
+        if not ready:
+            line_number, parent = min(pending.values())
+            raise ValueError(f"activities line {line_number}: unknown parent '{parent}' (or a cycle)")
+        for name in ready:
+            line_number, parent = pending.pop(name)
+            level = levels[parent] + 1 if parent is not None else 1
+            if level > MAX_ACTIVITY_LEVEL:
+                raise ValueError(f"activities line {line_number}: '{name}' exceeds {MAX_ACTIVITY_LEVEL} level depth")
+            levels[name] = level
+            planned.append((name, parent, level))
+    return planned
+
+
+def import_activities(
+    connection: Connection, planned: list[tuple[str, str | None, int]], activity_map: dict[str, tuple[int, int]]
+) -> int:
+    # The tree is small; row-by-row RETURNING keeps parent ids simple.
+    for name, parent, level in planned:
+        parent_id = activity_map[parent][0] if parent is not None else None
+        activity_id = connection.scalar(
+            insert(Activity).values(name=name, parent_id=parent_id, level=level).returning(Activity.id)
+        )
+        activity_map[name] = (activity_id, level)
+    if planned:
+        rebuild_activity_closure(connection)
+    return len(planned)
+
+
+def import_buildings(
+    connection: Connection,
+    records: Iterable[tuple[int, dict[str, Any]]],
+    building_map: dict[str, int],
+    batch_size: int,
+) -> int:
+    allocator = IdAllocator(connection, Building.__table__)
+    imported = 0
+    for batch in batched(records, batch_size):
+        rows, addresses = [], set()
+        for line_number, record in batch:
+            address = (record.get("address") or "").strip()
+            if not address:
+                raise ValueError(f"buildings line {line_number}: address is required")
+            if address in building_map or address in addresses:
+                continue
+            try:
+                latitude, longitude = float(record["latitude"]), float(record["longitude"])
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError(f"buildings line {line_number}: invalid coordinates") from exc
+            addresses.add(address)
+            rows.append((address, latitude, longitude))
+
+        rows = [(building_id, *row) for row, building_id in zip(rows, allocator.take(len(rows)))]
+        for building_id, address, _, _ in rows:
+            building_map[address] = building_id
+        write_rows(connection, Building.__table__, ("id", "address", "latitude", "longitude"), rows)
+        imported += len(rows)
+    return imported
+
+
+def existing_organizations(connection: Connection, names: list[str]) -> dict[str, int]:
+    """Ids of the organizations already stored under ``names``, looked up through the unique index."""
+    found: dict[str, int] = {}
+    for start in range(0, len(names), NAME_LOOKUP_CHUNK):
+        query = select(Organization.name, Organization.id).where(
+            Organization.name.in_(names[start : start + NAME_LOOKUP_CHUNK])
+        )
+        found.update(connection.execute(query).all())
+    return found
+
+
+def import_organizations(
+    connection: Connection,
+    records: Iterable[tuple[int, dict[str, Any]]],
+    building_map: dict[str, int],
+    activity_map: dict[str, tuple[int, int]],
+    batch_size: int,
+) -> int:
+    """Write organizations batch by batch, skipping names stored before the import; a repeated name is an error."""
+    allocator = IdAllocator(connection, Organization.__table__)
+    first_id: int | None = None
+    imported = 0
+    for batch in batched(records, batch_size):
+        names: set[str] = set()
+        for line_number, record in batch:
+            name = (record.get("name") or "").strip()
+            if not name:
+                raise ValueError(f"organizations line {line_number}: name is required")
+            if name in names:
+                raise ValueError(f"organizations line {line_number}: duplicate organization '{name}'")
+            names.add(name)
+        stored = existing_organizations(connection, list(names))
+
+        accepted = []
+        for line_number, record in batch:
+            name = record["name"].strip()
+            if name in stored:
+                # An id handed out by this import means an earlier batch had the same name.
+                if first_id is not None and stored[name] >= first_id:
+                    raise ValueError(f"organizations line {line_number}: duplicate organization '{name}'")
+                continue
+            building_id = building_map.get((record.get("building") or "").strip())
+            if building_id is None:
+                raise ValueError(f"organizations line {line_number}: unknown building '{record.get('building')}'")
+            activity_ids = set()
+            for activity_name in as_list(record.get("activities")):
+                if activity_name not in activity_map:
+                    raise ValueError(f"organizations line {line_number}: unknown activity '{activity_name}'")
+                activity_ids.add(activity_map[activity_name][0])
+            accepted.append((name, building_id, as_list(record.get("phones")), activity_ids))
+
+        organizations, phones, links = [], [], []
+        for (name, building_id, phone_numbers, activity_ids), organization_id in zip(
+            accepted, allocator.take(len(accepted))
+        ):
+            organizations.append((organization_id, name, building_id))
+            phones.extend((organization_id, phone) for phone in phone_numbers)
+            links.extend((organization_id, activity_id) for activity_id in activity_ids)
+        if organizations and first_id is None:
+            first_id = organizations[0][0]
+
+        write_rows(connection, Organization.__table__, ("id", "name", "building_id"), organizations)
+        write_rows(connection, OrganizationPhone.__table__, ("organization_id", "phone_number"), phones)
+        write_rows(connection, organization_activities, ("organization_id", "activity_id"), links)
+        imported += len(organizations)
+    return imported
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--activities", type=pathlib.Path)
+    parser.add_argument("--buildings", type=pathlib.Path)
+    parser.add_argument("--organizations", type=pathlib.Path)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with get_engine().begin() as connection:
+        activity_map = {
+            name: (activity_id, level)
+            for activity_id, name, level in connection.execute(select(Activity.id, Activity.name, Activity.level))
+        }
+        planned = plan_activities(read_records(args.activities), activity_map) if args.activities else []
+        building_map = {
+            address: building_id for address, building_id in connection.execute(select(Building.address, Building.id))
+        }
+
+        counts = {"activities": import_activities(connection, planned, activity_map)}
+        if args.buildings:
+            counts["buildings"] = import_buildings(
+                connection, read_records(args.buildings), building_map, args.batch_size
+            )
+        if args.organizations:
+            organizations_started = time.perf_counter()
+            counts["organizations"] = import_organizations(
+                connection,
+                read_records(args.organizations),
+                building_map,
+                activity_map,
+                args.batch_size,
+            )
+            elapsed = time.perf_counter() - organizations_started
+            print(f"organizations: {counts['organizations'] / max(elapsed, 1e-9):,.0f} rows/s")
+        if changed := [scope for scope, count in counts.items() if count]:
+            bump_stored_versions(connection, changed)
+
+    if counts.get("buildings") or counts.get("organizations"):
+        clear_shared_organization_cache(get_settings())
+    summary = ", ".join(f"{count} {kind}" for kind, count in counts.items())
+    print(f"Imported {summary} in {time.perf_counter() - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Bring the database up to date before the server starts, doing nothing when it already is.
+
+Usage: python scripts/prestart.py
+
+One query reads the applied Alembic revision and whether the demo data is
+present. Migrations run only when the revision is behind the newest one, and
+the seed only when the demo organizations are missing, so a restarted
+container goes straight to serving.
+"""
+from __future__ import annotations
+
+import pathlib
+import sys
+import time
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import column, func, select, table
+from sqlalchemy.exc import DBAPIError
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from app.db.session import get_engine
+from app.models import Organization
+from scripts.seed_data import DEMO_ORGANIZATIONS, seed
+
+alembic_version = table("alembic_version", column("version_num"))
+
+
+def database_state() -> tuple[str | None, bool]:
+    """``(applied revision, demo data present)``; a database that was never migrated reads as ``(None, False)``."""
+    names = [payload["name"] for payload in DEMO_ORGANIZATIONS]
+    stmt = select(
+        select(alembic_version.c.version_num).scalar_subquery(),
+        select(func.count()).select_from(Organization).where(Organization.name.in_(names)).scalar_subquery(),
+    )
+    try:
+        with get_engine().connect() as connection:
+            revision, seeded = connection.execute(stmt).one()
+    except DBAPIError:
+        # Missing tables: nothing has been applied yet.
+        return None, False
+    return revision, seeded == len(names)
+
+
+def main() -> None:
+    started = time.perf_counter()
+    config = Config(str(BASE_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BASE_DIR / "alembic"))
+    head = ScriptDirectory.from_config(config).get_current_head()
+    revision, seeded = database_state()
+
+    if revision != head:
+        print(f"Migrating from {revision or 'an empty database'} to {head}.")
+        command.upgrade(config, "head")
+    if not seeded:
+        seed()
+    if revision == head and seeded:
+        print(f"Schema at {head} and demo data present; nothing to do ({time.perf_counter() - started:.2f}s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,115 @@
+"""Seed the demo directory, optionally followed by a synthetic data set for benchmarks.
+
+Usage: python scripts/seed_data.py [--buildings 20000 --organizations 200000] [--seed 42]
+
+Synthetic buildings are spread around several large cities, densest in their
+centres; organizations get 1-3 phones and activities from a 3-level tree that
+extends the demo one. Rows go through the bulk importer's batched path, and
+names and addresses are numbered past the existing rows, so the generator can
+be re-run on top of earlier data.
+"""
 from __future__ import annotations
 
+import argparse
+import math
 import pathlib
+import random
 import sys
+from collections.abc import Iterator
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
 if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
 
-from app.db.session import SessionLocal
+from app.core.config import get_settings
+from app.db.session import get_engine, get_sessionmaker
+from app.db.versioning import bump_stored_versions
 from app.models import Activity, Building, Organization, OrganizationPhone
+from app.services.entity_cache import clear_shared_organization_cache
+from scripts.bulk_import import import_activities, import_buildings, import_organizations, plan_activities
+
+# City, centre latitude/longitude, spread in km (one standard deviation), share of buildings.
+CITIES = [
+    ("Москва", 55.7558, 37.6173, 12.0, 0.35),
+    ("Санкт-Петербург", 59.9343, 30.3351, 9.0, 0.15),
+    ("Новосибирск", 55.0084, 82.9357, 7.0, 0.08),
+    ("Екатеринбург", 56.8389, 60.6057, 6.0, 0.08),
+    ("Казань", 55.7961, 49.1064, 6.0, 0.07),
+    ("Нижний Новгород", 56.2965, 43.9361, 6.0, 0.07),
+    ("Краснодар", 45.0355, 38.9753, 5.0, 0.07),
+    ("Самара", 53.1959, 50.1002, 5.0, 0.07),
+    ("Владивосток", 43.1155, 131.8855, 4.0, 0.06),
+]
+STREETS = ["Ленина", "Мира", "Садовая", "Советская", "Гагарина", "Пушкина", "Лесная", "Школьная", "Новая", "Заводская"]
+ACTIVITY_ROOTS = ["Еда", "Автомобили", "Строительство", "Медицина", "Образование", "Услуги", "Торговля", "Логистика"]
+ACTIVITY_BRANCHING = 4
+NAME_PREFIXES = ["ООО", "ЗАО", "АО", "ИП", "ПАО"]
+NAME_WORDS = [
+    "Рога", "Копыта", "Сытный", "Дом", "Авто", "Макс", "Груз", "Лайн", "Молоко", "Мясо", "Север", "Юг",
+    "Восток", "Запад", "Строй", "Торг", "Сервис", "Маркет", "Альфа", "Вега", "Омега", "Технологии",
+]
+KM_PER_DEGREE = 111.32
+
+DEMO_BUILDINGS: list[dict[str, Any]] = [
+    {"address": "г. Москва, ул. Ленина 1, офис 3", "latitude": 55.7522, "longitude": 37.6156},
+    {"address": "г. Новосибирск, ул. Блюхера 32/1", "latitude": 55.0736, "longitude": 82.9590},
+    {"address": "г. Санкт-Петербург, Невский пр. 12", "latitude": 59.9343, "longitude": 30.3351},
+]
+
+DEMO_ACTIVITIES: list[dict[str, Any]] = [
+    {"name": "Еда", "parent": None},
+    {"name": "Мясная продукция", "parent": "Еда"},
+    {"name": "Молочная продукция", "parent": "Еда"},
+    {"name": "Автомобили", "parent": None},
+    {"name": "Грузовые", "parent": "Автомобили"},
+    {"name": "Легковые", "parent": "Автомобили"},
+    {"name": "Запчасти", "parent": "Легковые"},
+    {"name": "Аксессуары", "parent": "Легковые"},
+]
+
+DEMO_ORGANIZATIONS: list[dict[str, Any]] = [
+    {
+        "name": "ООО Рога и Копыта",
+        "building": "г. Новосибирск, ул. Блюхера 32/1",
+        "phones": ["2-222-222", "3-333-333", "+7-923-666-13-13"],
+        "activities": ["Еда", "Мясная продукция"],
+    },
+    {
+        "name": "ЗАО Сытный Дом",
+        "building": "г. Москва, ул. Ленина 1, офис 3",
+        "phones": ["+7-495-111-22-33"],
+        "activities": ["Еда", "Молочная продукция"],
+    },
+    {
+        "name": "ООО АвтоМакс",
+        "building": "г. Санкт-Петербург, Невский пр. 12",
+        "phones": ["+7-812-555-00-11"],
+        "activities": ["Автомобили", "Легковые", "Аксессуары"],
+    },
+    {
+        "name": "ИП ГрузЛайн",
+        "building": "г. Москва, ул. Ленина 1, офис 3",
+        "phones": ["+7-495-700-44-55"],
+        "activities": ["Автомобили", "Грузовые"],
+    },
+]
 
 
 def create_buildings(db: Session) -> dict[str, Building]:
-    building_payload = [
-        {"address": "г. Москва, ул. Ленина 1, офис 3", "latitude": 55.7522, "longitude": 37.6156},
-        {"address": "г. Новосибирск, ул. Блюхера 32/1", "latitude": 55.0736, "longitude": 82.9590},
-        {"address": "г. Санкт-Петербург, Невский пр. 12", "latitude": 59.9343, "longitude": 30.3351},
-    ]
+    # One lookup per table keeps re-seeding an already seeded database cheap.
+    existing = {
+        building.address: building
+        for building in db.scalars(
+            select(Building).where(Building.address.in_([payload["address"] for payload in DEMO_BUILDINGS]))
+        )
+    }
     mapping: dict[str, Building] = {}
-    for payload in building_payload:
-        building = db.scalar(select(Building).where(Building.address == payload["address"]))
+    for payload in DEMO_BUILDINGS:
+        building = existing.get(payload["address"])
         if not building:
             building = Building(**payload)
             db.add(building)
@@ -32,28 +119,19 @@ def create_buildings(db: Session) -> dict[str, Building]:
 
 
 def create_activities(db: Session) -> dict[str, Activity]:
-    activity_payload = [
-        {"name": "Еда", "parent": None},
-        {"name": "Мясная продукция", "parent": "Еда"},
-        {"name": "Молочная продукция", "parent": "Еда"},
-        {"name": "Автомобили", "parent": None},
-        {"name": "Грузовые", "parent": "Автомобили"},
-        {"name": "Легковые", "parent": "Автомобили"},
-        {"name": "Запчасти", "parent": "Легковые"},
-        {"name": "Аксессуары", "parent": "Легковые"},
-    ]
-    activity_map: dict[str, Activity] = {}
-
-    for payload in activity_payload:
-        existing = db.scalar(select(Activity).where(Activity.name == payload["name"]))
-        if existing:
-            activity_map[existing.name] = existing
+    activity_map: dict[str, Activity] = {
+        activity.name: activity
+        for activity in db.scalars(
+            select(Activity).where(Activity.name.in_([payload["name"] for payload in DEMO_ACTIVITIES]))
+        )
+    }
+
+    for payload in DEMO_ACTIVITIES:
+        if payload["name"] in activity_map:
             continue
 
         if payload["parent"]:
-            parent = activity_map.get(payload["parent"]) or db.scalar(
-                select(Activity).where(Activity.name == payload["parent"])
-            )
+            parent = activity_map.get(payload["parent"])
             if not parent:
                 raise ValueError(f"Parent activity '{payload['parent']}' not found")
             level = parent.level + 1
@@ -72,36 +150,14 @@ def create_activities(db: Session) -> dict[str, Activity]:
 
 
 def create_organizations(db: Session, buildings: dict[str, Building], activities: dict[str, Activity]) -> None:
-    organization_payload = [
-        {
-            "name": "ООО Рога и Копыта",
-            "building": "г. Новосибирск, ул. Блюхера 32/1",
-            "phones": ["2-222-222", "3-333-333", "+7-923-666-13-13"],
-            "activities": ["Еда", "Мясная продукция"],
-        },
-        {
-            "name": "ЗАО Сытный Дом",
-            "building": "г. Москва, ул. Ленина 1, офис 3",
-            "phones": ["+7-495-111-22-33"],
-            "activities": ["Еда", "Молочная продукция"],
-        },
-        {
-            "name": "ООО АвтоМакс",
-            "building": "г. Санкт-Петербург, Невский пр. 12",
-            "phones": ["+7-812-555-00-11"],
-            "activities": ["Автомобили", "Легковые", "Аксессуары"],
-        },
-        {
-            "name": "ИП ГрузЛайн",
-            "building": "г. Москва, ул. Ленина 1, офис 3",
-            "phones": ["+7-495-700-44-55"],
-            "activities": ["Автомобили", "Грузовые"],
-        },
-    ]
-
-    for payload in organization_payload:
-        existing = db.scalar(select(Organization).where(Organization.name == payload["name"]))
-        if existing:
+
+    existing = set(
+        db.scalars(
+            select(Organization.name).where(Organization.name.in_([payload["name"] for payload in DEMO_ORGANIZATIONS]))
+        )
+    )
+    for payload in DEMO_ORGANIZATIONS:
+        if payload["name"] in existing:
             continue
 
         building = buildings[payload["building"]]
@@ -116,13 +172,91 @@ def create_organizations(db: Session, buildings: dict[str, Building], activities
         db.add(organization)
 
 
+def activity_records() -> Iterator[dict[str, Any]]:
+    for root in ACTIVITY_ROOTS:
+        yield {"name": root, "parent": None}
+        for section in range(1, ACTIVITY_BRANCHING + 1):
+            parent = f"{root}: направление {section}"
+            yield {"name": parent, "parent": root}
+            for subsection in range(1, ACTIVITY_BRANCHING + 1):
+                yield {"name": f"{parent}.{subsection}", "parent": parent}
+
+
+def building_records(rng: random.Random, count: int, start: int) -> Iterator[dict[str, Any]]:
+    weights = [share for *_, share in CITIES]
+    for number in range(start, start + count):
+        city, latitude, longitude, spread_km, _ = rng.choices(CITIES, weights)[0]
+        # Gaussian around the centre: dense downtown, sparse outskirts.
+        north_km, east_km = rng.gauss(0, spread_km), rng.gauss(0, spread_km)
+        yield {
+            "address": f"г. {city}, ул. {rng.choice(STREETS)}, д. {number}",
+            "latitude": round(latitude + north_km / KM_PER_DEGREE, 6),
+            "longitude": round(longitude + east_km / (KM_PER_DEGREE * math.cos(math.radians(latitude))), 6),
+        }
+
+
+def remember_addresses(records: Iterator[dict[str, Any]], addresses: list[str]) -> Iterator[dict[str, Any]]:
+    for record in records:
+        addresses.append(record["address"])
+        yield record
+
+
+def organization_records(
+    rng: random.Random, count: int, start: int, addresses: list[str], activities: list[str]
+) -> Iterator[dict[str, Any]]:
+    for number in range(start, start + count):
+        # Skewed towards the first addresses, so some buildings act as large business centres.
+        address = addresses[int(len(addresses) * rng.random() ** 2)]
+        yield {
+            "name": f"{rng.choice(NAME_PREFIXES)} {' '.join(rng.sample(NAME_WORDS, 2))} {number}",
+            "building": address,
+            "phones": [
+                f"+7-9{rng.randrange(10, 100)}-{rng.randrange(100, 1000)}-{rng.randrange(1000, 10000)}"
+                for _ in range(rng.randint(1, 3))
+            ],
+            "activities": rng.sample(activities, rng.randint(1, 3)),
+        }
+
+
+def generate(buildings: int, organizations: int, seed: int, batch_size: int) -> None:
+    """Add ``buildings`` and ``organizations`` synthetic rows in one transaction."""
+    rng = random.Random(seed)
+    with get_engine().begin() as connection:
+        activity_map = {
+            name: (activity_id, level)
+            for activity_id, name, level in connection.execute(select(Activity.id, Activity.name, Activity.level))
+        }
+        planned = plan_activities(enumerate(activity_records(), start=1), activity_map)
+        import_activities(connection, planned, activity_map)
+        activities = [name for name, _ in sorted(activity_map.items(), key=lambda item: item[1])]
+
+        building_map = {
+            address: building_id for address, building_id in connection.execute(select(Building.address, Building.id))
+        }
+        start = (connection.scalar(select(func.max(Building.id))) or 0) + 1
+        addresses: list[str] = []
+        records = remember_addresses(building_records(rng, buildings, start), addresses)
+        import_buildings(connection, enumerate(records, start=1), building_map, batch_size)
+        addresses = addresses or list(building_map)
+        if organizations and not addresses:
+            raise ValueError("No buildings to place organizations in; pass --buildings")
+
+        start = (connection.scalar(select(func.max(Organization.id))) or 0) + 1
+        records = organization_records(rng, organizations, start, addresses, activities)
+        import_organizations(connection, enumerate(records, start=1), building_map, activity_map, batch_size)
+        bump_stored_versions(connection, ("activities", "buildings", "organizations"))
+    clear_shared_organization_cache(get_settings())
+    print(f"Generated {buildings} buildings and {organizations} organizations.")
+
+
 def seed() -> None:
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         buildings = create_buildings(db)
         activities = create_activities(db)
         create_organizations(db, buildings, activities)
         db.commit()
+        clear_shared_organization_cache(get_settings())
         print("Database seeded successfully.")
     except Exception:
         db.rollback()
@@ -131,5 +265,18 @@ def seed() -> None:
         db.close()
 
 
-if __name__ == "__main__":
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--buildings", type=int, default=0, help="Synthetic buildings to add")
+    parser.add_argument("--organizations", type=int, default=0, help="Synthetic organizations to add")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+
     seed()
+    if args.buildings or args.organizations:
+        generate(args.buildings, args.organizations, args.seed, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
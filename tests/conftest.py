@@ -0,0 +1,30 @@
+import os
+import tempfile
+
+import pytest
+
+API_KEY = "test-api-key"
+
+# Settings are read once on import, so the environment is set before anything imports the app.
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='directory-tests-')}/test.db"
+os.environ["API_KEY"] = API_KEY
+
+
+@pytest.fixture(scope="session")
+def database() -> None:
+    from app.db.base import Base
+    from app.db.session import get_engine
+    from scripts.seed_data import seed
+
+    Base.metadata.create_all(get_engine())
+    seed()
+
+
+@pytest.fixture
+def client(database):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app, headers={"X-API-Key": API_KEY}) as client:
+        yield client
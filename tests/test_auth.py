@@ -0,0 +1,42 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse
+
+from app.api.auth import API_KEY_HEADER, API_KEY_STATE, ApiKey, ApiKeyMiddleware, MemoryRateLimiter
+
+
+async def echo_key(scope, receive, send):
+    await JSONResponse({"key": scope.get("state", {}).get(API_KEY_STATE)})(scope, receive, send)
+
+
+@pytest.fixture
+def client():
+    keys = [ApiKey("limited", "limited-secret", rate=1, burst=2), ApiKey("unlimited", "unlimited-secret")]
+    app = ApiKeyMiddleware(echo_key, keys=keys, limiter=MemoryRateLimiter(), prefix="/api")
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("headers", [{}, {API_KEY_HEADER: "wrong"}])
+def test_missing_or_unknown_key_is_rejected(client, headers):
+    response = client.get("/api/organizations/1", headers=headers)
+    assert response.status_code == 401
+
+
+def test_accepted_key_is_recorded(client):
+    response = client.get("/api/organizations/1", headers={API_KEY_HEADER: "unlimited-secret"})
+    assert response.status_code == 200
+    assert response.json() == {"key": "unlimited"}
+
+
+def test_paths_outside_the_prefix_need_no_key(client):
+    assert client.get("/health").json() == {"key": None}
+
+
+def test_empty_bucket_answers_429(client):
+    headers = {API_KEY_HEADER: "limited-secret"}
+    assert [client.get("/api/buildings/", headers=headers).status_code for _ in range(2)] == [200, 200]
+    limited = client.get("/api/buildings/", headers=headers)
+    assert limited.status_code == 429
+    assert int(limited.headers["Retry-After"]) >= 1
+    # Buckets are per key.
+    assert client.get("/api/buildings/", headers={API_KEY_HEADER: "unlimited-secret"}).status_code == 200
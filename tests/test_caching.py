@@ -0,0 +1,28 @@
+from app.db.session import get_sessionmaker
+from app.db.versioning import data_versions
+from app.models import Activity
+
+
+def test_activities_revalidate_until_the_data_changes(client):
+    first = client.get("/api/activities/")
+    etag = first.headers["ETag"]
+
+    not_modified = client.get("/api/activities/", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert client.get("/api/activities/", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+
+    version = data_versions.current("activities")
+    with get_sessionmaker()() as db:
+        activity = Activity(name="Тестовая деятельность", level=1)
+        db.add(activity)
+        db.commit()
+        try:
+            assert data_versions.current("activities") > version
+            changed = client.get("/api/activities/", headers={"If-None-Match": etag})
+            assert changed.status_code == 200
+            assert changed.headers["ETag"] != etag
+            assert "Тестовая деятельность" in {node["name"] for node in changed.json()}
+        finally:
+            db.delete(activity)
+            db.commit()
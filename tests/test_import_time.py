@@ -0,0 +1,45 @@
+"""Importing the app stays cheap: engines are created by the lifespan handler and migrations run in prestart.py."""
+import os
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+BASE_DIR = pathlib.Path(__file__).resolve().parents[1]
+FORBIDDEN_MODULES = ("alembic", "asyncpg", "psycopg2", "aiosqlite")
+# Set for the machine the tests run on; the forbidden imports hold everywhere.
+IMPORT_TIME_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", "2500"))
+RUNS = 3
+
+
+def profile_import(module: str) -> dict[str, int]:
+    """Cumulative import time in µs per module, from a fresh interpreter under ``-X importtime``."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line.removeprefix("import time:").split("|")
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+@pytest.fixture(scope="module")
+def app_import() -> dict[str, int]:
+    # The fastest run, so a cold disk cache does not fail the budget.
+    return min((profile_import("app.main") for _ in range(RUNS)), key=lambda run: run["app.main"])
+
+
+def test_no_database_driver_or_alembic_at_import(app_import):
+    assert [module for module in FORBIDDEN_MODULES if module in app_import] == []
+
+
+def test_import_time_within_budget(app_import):
+    assert app_import["app.main"] / 1000 <= IMPORT_TIME_BUDGET_MS
@@ -0,0 +1,56 @@
+import pytest
+
+from app.services.exceptions import ValidationError
+from app.services.pagination import decode_cursor, encode_cursor, paginate
+
+
+@pytest.mark.parametrize("name", ["ООО Рога и Копыта", 'quote " and ,', ""])
+def test_cursor_round_trip(name):
+    assert decode_cursor(encode_cursor(name, 42)) == (name, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "WzEsMl0", "e30"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor)
+
+
+class Row:
+    def __init__(self, name, id):
+        self.name = name
+        self.id = id
+
+
+def test_pages_break_name_ties_by_id():
+    rows = [Row(name, id) for name, id in [("a", 1), ("b", 2), ("b", 3), ("b", 5), ("c", 4)]]
+
+    def fetch(limit, after):
+        return [row for row in rows if after is None or (row.name, row.id) > after][:limit]
+
+    seen, cursor = [], None
+    while True:
+        page = paginate(fetch, 2, cursor)
+        seen.extend(row.id for row in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    assert seen == [1, 2, 3, 5, 4]
+
+
+def test_api_pages_cover_the_list(client):
+    expected = [item["id"] for item in client.get("/api/activities/1/organizations?limit=200").json()["items"]]
+    assert len(expected) > 1
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 1} if cursor is None else {"limit": 1, "cursor": cursor}
+        page = client.get("/api/activities/1/organizations", params=params).json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+def test_api_rejects_a_bad_cursor(client):
+    assert client.get("/api/activities/1/organizations?cursor=bad").status_code == 400
@@ -0,0 +1,57 @@
+import pytest
+
+from app.core import geo
+from app.services import spatial_index, tiles
+from app.services.spatial_index import BuildingGridIndex
+from app.services.tiles import cluster_tile
+
+POINTS = [
+    (1, 10.0, 0.0),  # on the edge between the western and eastern tiles
+    (2, 0.0, -45.0),  # on the equator, between the northern and southern tiles
+    (3, 20.0, 180.0),  # on the eastern edge of the map
+    (4, -85.0511287798, 90.0),  # on the southern Mercator limit
+    (5, 89.9, -120.0),  # beyond the northern limit
+    (6, -89.9, 120.0),  # beyond the southern limit
+    (2**60 + 7, 30.0, -179.5),  # an id too large for float64
+]
+
+
+@pytest.fixture(params=["numpy", "pure python"])
+def index(request, monkeypatch):
+    if request.param == "pure python":
+        for module in (geo, spatial_index, tiles):
+            monkeypatch.setattr(module, "np", None)
+    elif tiles.np is None:
+        pytest.skip("numpy is not installed")
+    return BuildingGridIndex(POINTS, cell_size=1.0)
+
+
+def tile_of(index, zoom):
+    located = {}
+    for x in range(2**zoom):
+        for y in range(2**zoom):
+            for cluster in cluster_tile(index, zoom, x, y, 256):
+                assert cluster.count == 1
+                assert cluster.building_id not in located
+                located[cluster.building_id] = (x, y)
+    return located
+
+
+@pytest.mark.parametrize("zoom", [0, 1, 3])
+def test_every_building_is_in_exactly_one_tile(index, zoom):
+    assert set(tile_of(index, zoom)) == {building_id for building_id, _, _ in POINTS}
+
+
+def test_shared_edges_belong_to_the_east_and_south(index):
+    located = tile_of(index, 1)
+    assert located[1] == (1, 0)
+    assert located[2] == (0, 1)
+
+
+def test_map_edges_are_closed(index):
+    located = tile_of(index, 1)
+    assert located[3] == (1, 0)
+    assert located[4] == (1, 1)
+    assert located[5] == (0, 0)
+    assert located[6] == (1, 1)
+    assert located[2**60 + 7] == (0, 0)